@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Benchmark the documentation generators on synthetic inputs of growing size.
+
+Each case times one entry point (md_to_docx, add_styled_table,
+replace_screenshots.process_file, the xlsx workbook writers) at several
+input sizes, recording the best wall time over a few repeats, throughput
+in units per second, and peak memory (measured in a separate, untimed run).
+
+Results can be saved as a baseline and later runs compared against it:
+
+    python scripts/benchmark.py --save-baseline     # on the known-good tree
+    python scripts/benchmark.py                     # after a change
+
+A case is reported as a regression when its time or peak memory exceeds the
+baseline by more than --threshold, and the script then exits 1. Timings are
+machine-specific, so compare against a baseline recorded on the same host.
+
+Full runs (and --startup on its own) also check CLI startup: the commands in
+STARTUP_COMMANDS must not import python-docx, openpyxl, Pillow or lxml, and
+must start within STARTUP_BUDGET of a bare interpreter.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+sys.path.insert(0, os.path.dirname(__file__))
+import image_pipeline
+import replace_screenshots
+from build_settings import CACHE_DIR
+import generate_docx
+from generate_docx import add_styled_table, create_styled_document, md_to_docx
+from xlsx_engine import SheetSpec, write_workbook
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DOCS_DIR = SCRIPTS_DIR.parent / 'docs'
+BASELINE_PATH = CACHE_DIR / 'benchmark-baseline.json'
+
+# Differences smaller than these are noise, whatever the ratio
+MIN_TIME_DELTA = 0.005      # seconds
+MIN_MEMORY_DELTA = 1 << 20  # bytes
+
+
+class Case(NamedTuple):
+    name: str
+    unit: str
+    sizes: tuple
+    # setup(size, workdir) -> (prepare, run): prepare() is untimed and
+    # returns the argument passed to the timed run()
+    setup: Callable
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+def synthetic_rows(n: int, cols: int = 5) -> list:
+    """n rows of short, varied cell text, some with inline markup."""
+    rows = []
+    for r in range(n):
+        row = [f"item-{r}", f"Value **{r % 97}**", f"`/api/v1/items/{r}`",
+               "Lorem ipsum dolor sit amet " * (1 + r % 3), str(r * 7 % 1000)]
+        rows.append(row[:cols])
+    return rows
+
+
+def synthetic_table_md(n_rows: int) -> str:
+    headers = ["Name", "Value", "Endpoint", "Description", "Count"]
+    lines = ["# Table", "", "| " + " | ".join(headers) + " |",
+             "|" + "---|" * len(headers)]
+    lines += ["| " + " | ".join(row) + " |" for row in synthetic_rows(n_rows)]
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_code_md(n_blocks: int, lines_per_block: int = 12) -> str:
+    parts = ["# Code", ""]
+    for b in range(n_blocks):
+        parts += [f"## Block {b}", "", "Some *text* before the `code`.", "", "```python"]
+        parts += [f"    value_{i} = compute({b}, {i})  # step {i}" for i in range(lines_per_block)]
+        parts += ["```", ""]
+    return "\n".join(parts)
+
+
+def synthetic_images(n: int, workdir: Path) -> list:
+    """Write n distinct screenshot-like PNGs; return their file names."""
+    from PIL import Image as PILImage, ImageDraw
+
+    names = []
+    for i in range(n):
+        img = PILImage.new('RGB', (1400, 900), (245, 247, 250))
+        draw = ImageDraw.Draw(img)
+        draw.rectangle((0, 0, 1400, 70), fill=(26, 86, 118))
+        for row in range(12):
+            y = 110 + row * 60
+            shade = (i * 37 + row * 11) % 200
+            draw.rectangle((40, y, 1360, y + 44), outline=(200, 200, 200),
+                           fill=(255, 255 - shade // 4, 255 - shade // 2))
+            draw.text((60, y + 14), f"Screen {i} row {row}", fill=(40, 40, 40))
+        name = f"shot-{i}.png"
+        img.save(workdir / name)
+        names.append(name)
+    return names
+
+
+def synthetic_images_md(names: list) -> str:
+    parts = ["# Screens", ""]
+    for name in names:
+        parts += [f"Step using {name}.", "", f"![{name} screen]({name})", ""]
+    return "\n".join(parts)
+
+
+def synthetic_placeholder_md(n: int) -> str:
+    """Placeholders cycling through every SCREENSHOT_MAP pattern plus misses."""
+    patterns = [p for p, _ in replace_screenshots.SCREENSHOT_MAP] + ["an unmapped region"]
+    return "\n\n".join(f"[SCREENSHOT: Shows the {patterns[i % len(patterns)]} area]"
+                       for i in range(n)) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+def _md_case(make_md, backend='python-docx'):
+    def setup(size, workdir):
+        md_path = workdir / 'bench.md'
+        md_path.write_text(make_md(size, workdir), encoding='utf-8')
+        docx_path = str(workdir / 'bench.docx')
+
+        def prepare():
+            # Cold image cache on every run, on disk and in this process
+            shutil.rmtree(image_pipeline.VARIANT_DIR, ignore_errors=True)
+            image_pipeline._variants.clear()
+            image_pipeline._media_pool.clear()
+
+        def run(_):
+            md_to_docx(str(md_path), docx_path, "Benchmark", "Synthetic input", backend=backend)
+        return prepare, run
+    return setup
+
+
+def _table_setup(size, workdir):
+    headers = ["Name", "Value", "Endpoint", "Description", "Count"]
+    rows = synthetic_rows(size)
+
+    def prepare():
+        return create_styled_document("Benchmark", "")
+
+    def run(doc):
+        add_styled_table(doc, headers, rows)
+    return prepare, run
+
+
+def _process_file_setup(size, workdir):
+    md_path = workdir / 'placeholders.md'
+    md_path.write_text(synthetic_placeholder_md(size), encoding='utf-8')
+
+    def run(_):
+        replace_screenshots.process_file(str(md_path), dry_run=True)
+    return (lambda: None), run
+
+
+def _workbook_setup(theme_name):
+    def setup(size, workdir):
+        headers, rows = ["Name", "Value", "Endpoint", "Description", "Count"], synthetic_rows(size)
+        rows = [[cell.replace('**', '') for cell in row] for row in rows]
+        theme = _themes()[theme_name]
+        sheets = [SheetSpec(f"Sheet {i}", headers, rows) for i in range(3)]
+
+        def run(_):
+            write_workbook(str(workdir / 'bench.xlsx'), sheets, theme)
+        return (lambda: None), run
+    return setup
+
+
+def _real_builders_setup(size, workdir):
+    """The actual inventory and api-reference builders, writing to workdir."""
+    import build_inventory
+
+    gx = _load_generate_xlsx()
+
+    def run(_):
+        gx.main(['--output-dir', str(workdir)])
+        build_inventory.main(['--output', str(workdir / 'inventory.xlsx')])
+    return (lambda: None), run
+
+
+_generate_xlsx = None
+
+
+def _load_generate_xlsx():
+    """Import docs/api-reference/_generate_xlsx.py without running its main."""
+    global _generate_xlsx
+    if _generate_xlsx is None:
+        path = DOCS_DIR / 'api-reference' / '_generate_xlsx.py'
+        spec = importlib.util.spec_from_file_location('_generate_xlsx', path)
+        _generate_xlsx = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_generate_xlsx)
+    return _generate_xlsx
+
+
+def _themes() -> dict:
+    import build_inventory
+    return {'inventory': build_inventory.inventory_theme(),
+            'api': _load_generate_xlsx().api_theme()}
+
+
+CASES = [
+    Case('md_to_docx/tables', 'rows', (10, 100, 1000, 10000),
+         _md_case(lambda n, _: synthetic_table_md(n))),
+    Case('md_to_docx/code', 'blocks', (1, 10, 100, 500),
+         _md_case(lambda n, _: synthetic_code_md(n))),
+    Case('md_to_docx/images', 'images', (0, 10, 50, 200),
+         _md_case(lambda n, workdir: synthetic_images_md(synthetic_images(n, workdir)))),
+    Case('md_to_docx/stream/tables', 'rows', (10, 100, 1000, 10000),
+         _md_case(lambda n, _: synthetic_table_md(n), backend='stream')),
+    Case('md_to_docx/stream/code', 'blocks', (1, 10, 100, 500),
+         _md_case(lambda n, _: synthetic_code_md(n), backend='stream')),
+    Case('add_styled_table', 'rows', (10, 100, 1000, 10000), _table_setup),
+    Case('process_file', 'placeholders', (10, 100, 1000, 10000), _process_file_setup),
+    Case('workbook/inventory', 'rows', (10, 100, 1000, 10000), _workbook_setup('inventory')),
+    Case('workbook/api', 'rows', (10, 100, 1000, 10000), _workbook_setup('api')),
+    Case('workbook/builders', 'runs', (1,), _real_builders_setup),
+]
+
+
+# ---------------------------------------------------------------------------
+# CLI startup
+# ---------------------------------------------------------------------------
+
+# Commands that must start without loading any of HEAVY_MODULES
+STARTUP_COMMANDS = [
+    (SCRIPTS_DIR / 'regenerate_all_docx.py', '--help'),
+    (SCRIPTS_DIR / 'build_docs.py', '--list'),
+    (SCRIPTS_DIR / 'replace_screenshots.py', '--help'),
+    (SCRIPTS_DIR / 'build_inventory.py', '--help'),
+    (DOCS_DIR / 'api-reference' / '_generate_xlsx.py', '--help'),
+]
+HEAVY_MODULES = ('docx', 'openpyxl', 'PIL', 'lxml')
+
+# Allowed time over a bare interpreter start. When set, these commands took
+# 35-100 ms over it; loading python-docx or openpyxl alone adds 100-150 ms.
+STARTUP_BUDGET = 0.15
+
+# Runs a script as __main__, then reports which heavy modules it loaded
+_STARTUP_PROBE = """
+import os, runpy, sys
+sys.argv = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(sys.argv[0]))
+try:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+except SystemExit:
+    pass
+sys.stderr.write('\\nLOADED:' + ','.join(m for m in %r if m in sys.modules) + '\\n')
+""" % (HEAVY_MODULES,)
+
+
+def _best_run_time(cmd: list, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_startup() -> list:
+    """Time each startup command and check what it imports; return failures."""
+    bare = _best_run_time([sys.executable, '-c', 'pass'])
+    failures = []
+    print(f"\n{'Startup command':<44}  {'Over bare':>9}  Heavy modules loaded")
+    for script, arg in STARTUP_COMMANDS:
+        label = f"{script.name} {arg}"
+        overhead = _best_run_time([sys.executable, str(script), arg]) - bare
+        probe = subprocess.run([sys.executable, '-c', _STARTUP_PROBE, str(script), arg],
+                               capture_output=True, text=True)
+        loaded = probe.stderr.rstrip().rpartition('LOADED:')[2]
+        flag = ""
+        if overhead > STARTUP_BUDGET or loaded:
+            flag = "  FAIL"
+            failures.append(label)
+        print(f"{label:<44}  {overhead * 1000:>7.0f}ms  {loaded or '-'}{flag}")
+    print(f"(bare interpreter: {bare * 1000:.0f}ms; budget {STARTUP_BUDGET * 1000:.0f}ms over it)")
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _proc_status_kb(field: str) -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def peak_memory(run, arg) -> tuple:
+    """Run run(arg) once; return (peak Python heap, peak RSS growth) in bytes.
+
+    The heap peak comes from tracemalloc and is deterministic, so it is what
+    baselines are compared on. lxml and Pillow allocate outside the Python
+    heap, so on Linux the rise in resident set size is reported as well (the
+    high-water mark is reset via /proc/self/clear_refs); it is None elsewhere.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        rss_before = _proc_status_kb('VmRSS')
+    except OSError:
+        rss_before = None
+
+    tracemalloc.start()
+    try:
+        run(arg)
+        heap_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    rss_growth = None
+    if rss_before is not None:
+        rss_growth = max(0, _proc_status_kb('VmHWM') - rss_before) * 1024
+    return heap_peak, rss_growth
+
+
+def measure(prepare, run, repeat: int) -> dict:
+    """Best wall time over up to repeat runs, then memory in one more run."""
+    times = []
+    for _ in range(repeat):
+        arg = prepare()
+        start = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - start)
+        # A single run of a slow case is signal enough
+        if times[-1] > 2.0:
+            break
+    heap_peak, rss_growth = peak_memory(run, prepare())
+    return {'seconds': min(times), 'peak_bytes': heap_peak, 'rss_bytes': rss_growth}
+
+
+def run_cases(cases, repeat: int, quick: bool) -> dict:
+    results = {}
+    print_header()
+    for case in cases:
+        sizes = case.sizes[:2] if quick else case.sizes
+        for size in sizes:
+            key = f"{case.name}[{size}]"
+            with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+                prepare, run = case.setup(size, Path(tmp))
+                # Generator output is noise here
+                with open(os.devnull, 'w') as devnull:
+                    stdout, sys.stdout = sys.stdout, devnull
+                    try:
+                        result = measure(prepare, run, repeat)
+                    finally:
+                        sys.stdout = stdout
+            result['size'] = size
+            result['unit'] = case.unit
+            results[key] = result
+            print_result(key, result)
+    return results
+
+
+def print_result(key: str, result: dict, width: int = 34):
+    size, seconds = result['size'], result['seconds']
+    rate = f"{size / seconds:,.0f} {result['unit']}/s" if size and seconds else "-"
+    rss = result.get('rss_bytes')
+    rss = f"{rss / (1 << 20):>8.1f} MB" if rss is not None else f"{'-':>11}"
+    print(f"{key:<{width}}  {seconds:>9.4f}s  {rate:>22}"
+          f"  {result['peak_bytes'] / (1 << 20):>8.1f} MB  {rss}")
+
+
+def print_header(width: int = 34):
+    print(f"{'Case':<{width}}  {'Best':>10}  {'Throughput':>22}  {'Heap peak':>11}  {'RSS growth':>11}")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print a comparison with baseline; return keys that regressed."""
+    regressions = []
+    print(f"\n{'Case':<34}  {'Time':>8}  {'Memory':>8}")
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<34}  {'new':>8}  {'new':>8}")
+            continue
+        t_ratio = result['seconds'] / base['seconds'] if base['seconds'] else 1.0
+        m_ratio = result['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1.0
+        slower = (t_ratio > threshold
+                  and result['seconds'] - base['seconds'] > MIN_TIME_DELTA)
+        bigger = (m_ratio > threshold
+                  and result['peak_bytes'] - base['peak_bytes'] > MIN_MEMORY_DELTA)
+        flag = "  REGRESSION" if slower or bigger else ""
+        print(f"{key:<34}  {t_ratio:>7.2f}x  {m_ratio:>7.2f}x{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', '--filter', default='',
+                        help="only run cases whose name contains this string")
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help="timed runs per case; the best is kept (default: 3)")
+    parser.add_argument('--quick', action='store_true',
+                        help="only the two smallest sizes of each case")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH,
+                        help=f"baseline to compare against (default: {BASELINE_PATH})")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store this run as the baseline instead of comparing")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="time or memory ratio counted as a regression (default: 1.25)")
+    parser.add_argument('--json', type=Path, metavar='PATH',
+                        help="also write the results to PATH")
+    parser.add_argument('--startup', action='store_true',
+                        help="only run the CLI startup check")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.startup:
+        sys.exit(1 if check_startup() else 0)
+    cases = [case for case in CASES if args.filter in case.name]
+    if not cases:
+        raise SystemExit(f"No case matches {args.filter!r}")
+
+    # Keep the base template, image variants and image index out of the real
+    # build cache, so every benchmark run starts from the same cold state
+    with tempfile.TemporaryDirectory(prefix='bench-cache-') as cache:
+        generate_docx.CACHE_DIR = Path(cache)
+        generate_docx._template_bytes = None
+        image_pipeline.VARIANT_DIR = Path(cache) / 'images'
+        image_pipeline.INDEX_PATH = Path(cache) / 'image-index.json'
+        results = run_cases(cases, max(1, args.repeat), args.quick)
+
+    # The startup check runs with every full benchmark
+    startup_failures = [] if args.filter else check_startup()
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, sort_keys=True), encoding='utf-8')
+
+    if args.save_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        baseline.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding='utf-8')
+        print(f"\nBaseline saved to {args.baseline}")
+    elif not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+    else:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.2f}x")
+            sys.exit(1)
+        print("\nNo regressions")
+
+    if startup_failures:
+        print(f"\n{len(startup_failures)} startup check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
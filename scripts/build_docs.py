@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Build every generated documentation artifact, rebuilding only what changed.
+
+The artifacts form a dependency graph:
+
+    screenshots        replace_screenshots.py rewrites [SCREENSHOT: ...]
+                       placeholders in docs/**/*.md
+    inventory.xlsx     build_inventory.py, from the "inventory" view of
+                       docs/data/inventory.jsonl
+    api-reference.xlsx docs/api-reference/_generate_xlsx.py (also writes
+                       data-models.xlsx), from the "reference" view
+    docx:<doc>.md      generate_docx.py, from the .md and its screenshots;
+                       depends on screenshots
+
+Each node declares its inputs and outputs. A node runs when the hash of its
+inputs differs from the last successful build or an output is missing.
+Nodes built from the inventory store hash the store views they read rather
+than the whole file, so editing an item only rebuilds the workbooks that
+list it. Independent nodes run in parallel, and a per-node timing table is
+printed.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import runpy
+import sys
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+sys.path.insert(0, os.path.dirname(__file__))
+from build_settings import CACHE_DIR, write_atomic
+from inventory_store import view_digest
+from markdown_blocks import referenced_images
+import regenerate_all_docx
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DOCS_DIR = SCRIPTS_DIR.parent / 'docs'
+STATE_PATH = CACHE_DIR / 'build-state.json'
+
+
+class Node(NamedTuple):
+    name: str
+    action: Callable        # module-level, so it can run in a worker process
+    args: tuple
+    inputs: Callable        # () -> list of Paths, evaluated once deps are built
+    outputs: list
+    deps: tuple = ()
+    views: tuple = ()       # inventory_store views the action reads
+
+
+# ---------------------------------------------------------------------------
+# Node actions (run in worker processes)
+# ---------------------------------------------------------------------------
+
+def run_replace_screenshots():
+    import replace_screenshots
+    replace_screenshots.main(['-j', '1'])
+
+
+def run_build_inventory():
+    import build_inventory
+    build_inventory.main([])
+
+
+def run_generate_xlsx():
+    generate_xlsx = runpy.run_path(str(DOCS_DIR / 'api-reference' / '_generate_xlsx.py'))
+    generate_xlsx['main']([])
+
+
+def run_docx(job):
+    md_rel, status, output, _ = regenerate_all_docx.convert_one(job)
+    sys.stdout.write(output)
+    if status == 'error':
+        raise RuntimeError(f"{md_rel} failed")
+
+
+def run_node(action, args):
+    """Run a node's action, returning (captured output, seconds, error)."""
+    buf = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    try:
+        with contextlib.redirect_stdout(buf):
+            action(*args)
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    return buf.getvalue(), time.perf_counter() - start, error
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+def _markdown_files():
+    return sorted(DOCS_DIR.rglob('*.md'))
+
+
+def _screenshots_inputs():
+    return [
+        SCRIPTS_DIR / 'replace_screenshots.py',
+        *_markdown_files(),
+        *sorted((DOCS_DIR / 'screenshots').glob('*')),
+    ]
+
+
+def _docx_inputs(md_path: Path):
+    def inputs():
+        images = [p for p in referenced_images(str(md_path)) if p.exists()]
+        return [
+            SCRIPTS_DIR / 'build_settings.py',
+            SCRIPTS_DIR / 'markdown_blocks.py',
+            SCRIPTS_DIR / 'generate_docx.py',
+            SCRIPTS_DIR / 'docx_package.py',
+            SCRIPTS_DIR / 'image_pipeline.py',
+            md_path,
+            *images,
+        ]
+    return inputs
+
+
+def build_graph() -> dict:
+    """Return all nodes keyed by name, in a stable order."""
+    store_inputs = [
+        SCRIPTS_DIR / 'xlsx_engine.py',
+        SCRIPTS_DIR / 'inventory_store.py',
+    ]
+    nodes = [
+        Node('screenshots', run_replace_screenshots, (),
+             _screenshots_inputs, _markdown_files()),
+        Node('inventory.xlsx', run_build_inventory, (),
+             lambda: [SCRIPTS_DIR / 'build_inventory.py', *store_inputs],
+             [DOCS_DIR / 'inventory.xlsx'], views=('inventory',)),
+        Node('api-reference.xlsx', run_generate_xlsx, (),
+             lambda: [DOCS_DIR / 'api-reference' / '_generate_xlsx.py', *store_inputs],
+             [DOCS_DIR / 'api-reference' / 'api-reference.xlsx',
+              DOCS_DIR / 'api-reference' / 'data-models.xlsx'], views=('reference',)),
+    ]
+    for job in regenerate_all_docx.build_jobs():
+        md_path = DOCS_DIR / job[0]
+        if md_path.exists():
+            nodes.append(Node(f"docx:{job[0]}", run_docx, (job,),
+                              _docx_inputs(md_path), [md_path.with_suffix('.docx')],
+                              deps=('screenshots',)))
+    return {node.name: node for node in nodes}
+
+
+def select(graph: dict, targets) -> dict:
+    """Restrict graph to the named targets and everything they depend on."""
+    if not targets:
+        return graph
+    wanted = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in graph:
+            raise SystemExit(f"Unknown target: {name} (see --list)")
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(graph[name].deps)
+    return {name: node for name, node in graph.items() if name in wanted}
+
+
+# ---------------------------------------------------------------------------
+# State
+# ---------------------------------------------------------------------------
+
+def load_state() -> dict:
+    try:
+        with open(STATE_PATH, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault('nodes', {})
+    state.setdefault('files', {})
+    return state
+
+
+def save_state(state: dict):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(STATE_PATH, json.dumps(state, indent=1, sort_keys=True))
+
+
+def file_digest(path: Path, state: dict) -> str:
+    """SHA-256 of a file, reused while its size and mtime are unchanged."""
+    key = str(path)
+    st = path.stat()
+    cached = state['files'].get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    state['files'][key] = [st.st_mtime_ns, st.st_size, h.hexdigest()]
+    return h.hexdigest()
+
+
+def input_digest(node: Node, state: dict) -> str:
+    h = hashlib.sha256(repr(node.args).encode('utf-8'))
+    for path in node.inputs():
+        h.update(str(path).encode('utf-8'))
+        h.update(file_digest(path, state).encode('ascii'))
+    for view in node.views:
+        h.update(view.encode('utf-8'))
+        h.update(view_digest(view).encode('ascii'))
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+def build(graph: dict, jobs: int, force: bool = False) -> list:
+    """Build graph; return (name, status, seconds) for each node in order."""
+    state = load_state()
+    results = {}
+    pending = dict(graph)
+    running = {}
+
+    # The process pool is only started once some node actually needs building
+    executor = None
+    try:
+        while pending or running:
+            # Start every node whose dependencies have finished
+            for name, node in list(pending.items()):
+                deps = [d for d in node.deps if d in graph]
+                if any(d not in results for d in deps):
+                    continue
+                del pending[name]
+                if any(results[d][0] in ('failed', 'blocked') for d in deps):
+                    results[name] = ('blocked', 0.0)
+                    continue
+                fresh = (not force and state['nodes'].get(name) == input_digest(node, state)
+                         and all(p.exists() for p in node.outputs))
+                if fresh:
+                    results[name] = ('up to date', 0.0)
+                elif jobs == 1:
+                    running[name] = run_node(node.action, node.args)
+                else:
+                    if executor is None:
+                        from concurrent.futures import ProcessPoolExecutor
+                        executor = ProcessPoolExecutor(max_workers=jobs)
+                    running[name] = executor.submit(run_node, node.action, node.args)
+
+            # Collect finished nodes
+            if jobs == 1 or not running:
+                done = list(running)
+            else:
+                from concurrent.futures import FIRST_COMPLETED, wait
+                futures = {fut: name for name, fut in running.items()}
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                done = [futures[fut] for fut in finished]
+            for name in done:
+                outcome = running.pop(name)
+                output, seconds, error = outcome if jobs == 1 else outcome.result()
+                sys.stdout.write(output)
+                if error:
+                    print(f"  ERROR: {name}: {error}")
+                    state['nodes'].pop(name, None)
+                    results[name] = ('failed', seconds)
+                else:
+                    # Re-hash: a node may rewrite its own inputs (screenshots)
+                    state['nodes'][name] = input_digest(graph[name], state)
+                    results[name] = ('built', seconds)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        save_state(state)
+
+    return [(name, *results[name]) for name in graph]
+
+
+def print_report(report: list, wall: float):
+    width = max(len(name) for name, _, _ in report)
+    print(f"\n{'Node':<{width}}  {'Status':<10}  {'Seconds':>8}")
+    for name, status, seconds in sorted(report, key=lambda r: -r[2]):
+        print(f"{name:<{width}}  {status:<10}  {seconds:>8.2f}")
+    counts = {}
+    for _, status, _ in report:
+        counts[status] = counts.get(status, 0) + 1
+    summary = ", ".join(f"{n} {status}" for status, n in counts.items())
+    print(f"\nDone in {wall:.2f}s: {summary}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('targets', nargs='*', help="nodes to build (default: all)")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of cores; 1 runs serially)",
+    )
+    parser.add_argument(
+        '-f', '--force', action='store_true',
+        help="rebuild every selected node even if its inputs are unchanged",
+    )
+    parser.add_argument('--list', action='store_true', help="list nodes and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    graph = build_graph()
+    if args.list:
+        for node in graph.values():
+            deps = f"  (after {', '.join(node.deps)})" if node.deps else ""
+            print(f"{node.name}{deps}")
+        return
+
+    graph = select(graph, args.targets)
+    start = time.perf_counter()
+    report = build(graph, max(1, args.jobs), args.force)
+    print_report(report, time.perf_counter() - start)
+    if any(status == 'failed' for _, status, _ in report):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Settings shared by the document generators and the incremental build tools.
+
+Deliberately free of heavy imports: the build tools read these on every run,
+including runs where nothing needs regenerating.
+"""
+
+import os
+from pathlib import Path
+
+# Bump whenever a change to generate_docx.py alters the generated .docx
+# output, so that incremental builds (see regenerate_all_docx.py) rebuild
+# everything.
+GENERATOR_VERSION = "5"
+
+# On-disk build caches (manifests, image variants); not committed.
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache'
+
+# Read once, while the process is single-threaded: os.umask can only be
+# queried by setting it
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def temp_file_for(path, buffering: int = -1):
+    """Open a uniquely named temp file beside path for writing its replacement.
+
+    Returns (binary file, temp Path). The file gets path's current
+    permissions, or the usual ones for a new file; rename it over path with
+    os.replace() once complete.
+    """
+    import tempfile
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.fchmod(fd, mode)
+    return os.fdopen(fd, 'wb', buffering=buffering), Path(tmp)
+
+
+def write_atomic(path, data):
+    """Replace path with data (bytes, or str written as UTF-8).
+
+    The data goes to a temp file that is then renamed into place, so readers
+    and concurrent writers only ever see a complete file.
+    """
+    f, tmp = temp_file_for(path)
+    try:
+        with f:
+            f.write(data.encode('utf-8') if isinstance(data, str) else data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Zip packaging for generated .docx files.
+
+A .docx is a zip of XML parts plus media. The XML compresses well, but PNG,
+JPEG and GIF media under word/media/ are already compressed, so deflating
+them again only costs CPU: they are stored as-is. The compression level for everything else
+is configurable; 1 is fastest, 9 gives the smallest files.
+
+Packages are written through a uniquely named, buffered temp file next to
+the destination and renamed into place once complete, so an interrupted or
+failed build never leaves a half-written .docx behind, and concurrent builds
+of the same document never write to the same file.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+
+from build_settings import temp_file_for
+
+# zlib level for XML parts (6 is zlib's default)
+COMPRESSLEVEL = 6
+# Embedded media with these suffixes are stored without compression; other
+# members (including the JPEG thumbnail in docProps/, which deflates well)
+# are compressed
+MEDIA_PREFIX = 'word/media/'
+STORED_SUFFIXES = ('.png', '.jpg', '.jpeg', '.jpe', '.gif')
+BUFFER_SIZE = 1 << 20
+
+
+class PackageWriter:
+    """Write zip members to a temporary file, then move it to path.
+
+    As a context manager, the package is committed when the block completes
+    and discarded if it raises.
+    """
+
+    def __init__(self, path, compresslevel: int = COMPRESSLEVEL):
+        self.path = Path(path)
+        # A unique, hidden name, so concurrent writers of the same package
+        # never share a temp file
+        self._file, self._tmp = temp_file_for(self.path, BUFFER_SIZE)
+        try:
+            self._zip = zipfile.ZipFile(self._file, 'w', zipfile.ZIP_DEFLATED,
+                                        compresslevel=compresslevel)
+        except BaseException:
+            self._file.close()
+            self._tmp.unlink(missing_ok=True)
+            raise
+
+    def write(self, name: str, data: bytes):
+        if name.startswith(MEDIA_PREFIX) and name.lower().endswith(STORED_SUFFIXES):
+            self._zip.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+        else:
+            self._zip.writestr(name, data)
+
+    def open(self, name: str):
+        """Return a binary stream that writes a compressed member incrementally."""
+        return self._zip.open(name, 'w')
+
+    def commit(self):
+        """Finish the package and move it into place."""
+        try:
+            self._zip.close()
+            self._file.close()
+            os.replace(self._tmp, self.path)
+        except BaseException:
+            self._file.close()
+            self._tmp.unlink(missing_ok=True)
+            raise
+
+    def discard(self):
+        """Abandon the package, removing the temporary file."""
+        try:
+            self._zip.close()
+        except Exception:
+            pass
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+def save_document(doc, path, compresslevel: int = COMPRESSLEVEL):
+    """Save a python-docx Document to path; the same parts as doc.save(path)."""
+    from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+    from docx.opc.pkgwriter import _ContentTypesItem
+
+    package = doc.part.package
+    parts = package.parts
+    for part in parts:
+        part.before_marshal()
+    with PackageWriter(path, compresslevel) as writer:
+        writer.write(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        writer.write(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        for part in parts:
+            writer.write(part.partname.membername, part.blob)
+            if len(part.rels):
+                writer.write(part.partname.rels_uri.membername, part.rels.xml)
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Streaming backend for md_to_docx: writes the .docx package directly.
+
+python-docx keeps the whole document as an lxml tree and every paragraph,
+run and table cell goes through its object model. Here word/document.xml is
+written as text instead, block by block, into a compressed zip entry, so
+memory stays flat however long the document is. The other package parts
+(styles, numbering, settings, header, footer, ...) are copied from the base
+template that create_styled_document() uses, and each block is given the
+same markup the python-docx renderer produces for it.
+
+Use it through md_to_docx(..., backend='stream').
+"""
+
+import functools
+import io
+import os
+import re
+import zipfile
+from datetime import date
+from pathlib import Path
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.spec import default_content_types
+from docx.shared import Inches
+from lxml import etree
+
+import image_pipeline
+from docx_package import COMPRESSLEVEL, PackageWriter
+from generate_docx import (
+    PLACEHOLDER_BORDER_XML, SHADING_XML, load_template, xml_fragment,
+)
+from markdown_blocks import (
+    INLINE_CACHE_SIZE, CodeBlock, Heading, Image, ListItem, Paragraph, Screenshot, Table,
+    inline_runs,
+)
+
+# Buffered document XML is compressed into the package in chunks this size
+FLUSH_SIZE = 64 * 1024
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+HEADER_PART = 'word/header1.xml'
+CONTENT_TYPES_PART = '[Content_Types].xml'
+
+# lxml refuses these characters, so python-docx would too
+INVALID_XML_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+RUN_BREAK_RE = re.compile(r'([\t\n\r])')
+PARAGRAPH_RE = re.compile(r'<w:p>.*?</w:p>|<w:p/>')
+RELATIONSHIP_ID_RE = re.compile(r' Id="([^"]+)"')
+DEFAULT_TYPE_RE = re.compile(r'<Default Extension="([^"]+)" ContentType="([^"]+)"/>')
+NUMERIC_ID_RE = re.compile(r' id="(\d+)"')
+
+# Run properties, in the order python-docx writes them
+BOLD_RPR = '<w:rPr><w:b/></w:rPr>'
+PLACEHOLDER_RPR = '<w:rPr><w:i/><w:color w:val="888888"/><w:sz w:val="20"/></w:rPr>'
+
+IMAGE_PPR = '<w:spacing w:before="160" w:after="80"/><w:jc w:val="center"/>'
+
+TABLE_PROPERTIES = (
+    '<w:tblPr><w:tblStyle w:val="{}"/><w:tblW w:type="auto" w:w="0"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+    ' w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+)
+
+PICTURE_XML = (
+    '<w:drawing><wp:inline xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+    '<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{id}" name="Picture {id}"/>'
+    '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+    '<pic:pic><pic:nvPicPr><pic:cNvPr id="0" name="{name}"/><pic:cNvPicPr/></pic:nvPicPr>'
+    '<pic:blipFill><a:blip r:embed="{rId}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+    '<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"/></pic:spPr></pic:pic></a:graphicData></a:graphic>'
+    '</wp:inline></w:drawing>'
+)
+
+
+# ---------------------------------------------------------------------------
+# Markup
+# ---------------------------------------------------------------------------
+
+def escape(text: str) -> str:
+    """Escape text for element content."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def quote(value: str) -> str:
+    """Escape text for a double-quoted attribute value."""
+    return escape(value).replace('"', '&quot;')
+
+
+def run_content(text: str) -> str:
+    """Markup for text inside a run, as python-docx's run.text setter makes it.
+
+    Tabs become <w:tab/>, newlines and carriage returns <w:br/>, and w:t
+    keeps surrounding whitespace with xml:space="preserve".
+    """
+    if INVALID_XML_RE.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, "
+                         "no NULL bytes or control characters")
+    out = []
+    for piece in RUN_BREAK_RE.split(text):
+        if piece == '\t':
+            out.append('<w:tab/>')
+        elif piece in ('\n', '\r'):
+            out.append('<w:br/>')
+        elif len(piece.strip()) < len(piece):
+            out.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+        elif piece:
+            out.append(f'<w:t>{escape(piece)}</w:t>')
+    return ''.join(out)
+
+
+def run(text: str, rpr: str = '') -> str:
+    content = rpr + run_content(text)
+    return f'<w:r>{content}</w:r>' if content else '<w:r/>'
+
+
+def paragraph(runs: str = '', ppr: str = '') -> str:
+    if ppr:
+        return f'<w:p><w:pPr>{ppr}</w:pPr>{runs}</w:p>'
+    return f'<w:p>{runs}</w:p>' if runs else '<w:p/>'
+
+
+@functools.lru_cache(maxsize=None)
+def fragment_markup(xml: str) -> str:
+    """Markup for an XML snippet shared with the python-docx renderer.
+
+    The snippet is parsed the same way (dropping blank text between
+    elements), then written back without its namespace declarations.
+    """
+    markup = etree.tostring(xml_fragment(xml), encoding='unicode')
+    return re.sub(r' xmlns:\w+="[^"]*"', '', markup)
+
+
+def paragraph_style(style_id: str) -> str:
+    return f'<w:pStyle w:val="{style_id}"/>'
+
+
+@functools.lru_cache(maxsize=None)
+def span_rpr(code_style: str, bold: bool, italic: bool) -> str:
+    """Run properties for an inline span; code_style is '' for plain text."""
+    props = ''.join((
+        f'<w:rStyle w:val="{code_style}"/>' if code_style else '',
+        '<w:b/>' if bold else '',
+        '<w:i/>' if italic else '',
+    ))
+    return f'<w:rPr>{props}</w:rPr>' if props else ''
+
+
+@functools.lru_cache(maxsize=INLINE_CACHE_SIZE)
+def formatted_runs(text: str, code_style: str) -> str:
+    """Runs for text with **bold**, *italic*, `code` and [link](...) spans.
+
+    code_style is the style id of the 'Code Char' character style.
+    """
+    return ''.join(run(spec.text, span_rpr(code_style if spec.code else '', spec.bold, spec.italic))
+                   for spec in inline_runs(text))
+
+
+# ---------------------------------------------------------------------------
+# Template
+# ---------------------------------------------------------------------------
+
+class _Template:
+    """The base template split into the pieces a streamed package needs."""
+
+    def __init__(self, package: bytes):
+        with zipfile.ZipFile(io.BytesIO(package)) as zf:
+            self.parts = {name: zf.read(name) for name in zf.namelist()}
+
+        document = self.parts[DOCUMENT_PART].decode('utf-8')
+        head, body = document.split('<w:body>', 1)
+        self.head = head + '<w:body>'
+        end = body.rindex('<w:sectPr')
+        body, self.tail = body[:end], body[end:]
+        # Title, subtitle and date placeholders, then the rest of the title page
+        matches = list(PARAGRAPH_RE.finditer(body))[:3]
+        self.title_page = [m.group(0) for m in matches]
+        self.body = body[matches[-1].end():]
+        self.next_id = max((int(n) for n in NUMERIC_ID_RE.findall(document)), default=0) + 1
+
+        doc = Document(io.BytesIO(package))
+        self.styles = doc.styles
+        section = doc.sections[-1]
+        self.block_width = section.page_width - section.left_margin - section.right_margin
+
+    @functools.lru_cache(maxsize=None)
+    def style_id(self, name: str) -> str:
+        return self.styles[name].style_id
+
+    @functools.lru_cache(maxsize=None)
+    def column_width(self, cols: int) -> int:
+        """Width in twips of each of cols equal columns, as doc.add_table sizes them."""
+        return int(round((self.block_width // cols) / 635))
+
+
+@functools.lru_cache(maxsize=1)
+def _template(package: bytes) -> _Template:
+    return _Template(package)
+
+
+def _fill(placeholder_xml: str, placeholder: str, text: str) -> str:
+    return placeholder_xml.replace(f'<w:t>{placeholder}</w:t>', run_content(text), 1)
+
+
+# ---------------------------------------------------------------------------
+# Document
+# ---------------------------------------------------------------------------
+
+class StreamDocument:
+    """A .docx package whose body is written block by block.
+
+    Mirrors the parts of create_styled_document() and Document.save() that
+    md_to_docx uses: construct with the output path and title, write blocks,
+    then save() (or discard() to abandon the package).
+    """
+
+    def __init__(self, path, title: str, subtitle: str = "",
+                 compresslevel: int = COMPRESSLEVEL):
+        self.template = _template(load_template())
+        self.title = title
+        # Fill in the title page first: a title that is not valid XML text
+        # raises here, before anything is written next to path
+        title_para, sub_para, date_para = self.template.title_page
+        generated = f"Generated: {date.today().strftime('%B %d, %Y')}"
+        title_page = ''.join((
+            _fill(title_para, 'Title', title),
+            _fill(sub_para, 'Subtitle', subtitle) if subtitle else '',
+            _fill(date_para, 'Generated:', generated),
+        ))
+
+        self._writer = PackageWriter(path, compresslevel)
+        try:
+            self._stream = self._writer.open(DOCUMENT_PART)
+        except BaseException:
+            self._writer.discard()
+            raise
+        self._buffer = []
+        self._buffered = 0
+        self._next_id = self.template.next_id
+        # pooled image -> (partname, rId), in order of first use
+        self._media = {}
+        self._rIds = set(RELATIONSHIP_ID_RE.findall(
+            self.template.parts[DOCUMENT_RELS_PART].decode('utf-8')))
+
+        self.write(self.template.head)
+        self.write(title_page)
+        self.write(self.template.body)
+
+    def write(self, xml: str):
+        """Append markup to word/document.xml."""
+        self._buffer.append(xml)
+        self._buffered += len(xml)
+        if self._buffered >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        self._stream.write(''.join(self._buffer).encode('utf-8'))
+        self._buffer.clear()
+        self._buffered = 0
+
+    def add_paragraph(self, runs: str = '', ppr: str = ''):
+        self.write(paragraph(runs, ppr))
+
+    def style_id(self, name: str) -> str:
+        return self.template.style_id(name)
+
+    def _relate_image(self, image) -> str:
+        """Return the rId of image's media part, adding the part on first use."""
+        entry = self._media.get(image)
+        if entry is None:
+            partname = f"word/media/image{len(self._media) + 1}.{image.ext}"
+            # Lowest free rId, as python-docx allocates them
+            n = 1
+            while f"rId{n}" in self._rIds:
+                n += 1
+            rId = f"rId{n}"
+            self._rIds.add(rId)
+            entry = self._media[image] = (partname, rId)
+        return entry[1]
+
+    def picture_run(self, image_path: str, width_in: float) -> str:
+        """A run holding an inline picture width_in inches wide, like run.add_picture()."""
+        image = image_pipeline.pooled_image(image_path)
+        cx, cy = image.scaled_dimensions(Inches(width_in), None)
+        rId = self._relate_image(image)
+        shape_id = self._next_id
+        self._next_id += 1
+        drawing = PICTURE_XML.format(cx=cx, cy=cy, id=shape_id, rId=rId,
+                                     name=quote(image.filename))
+        return f'<w:r>{drawing}</w:r>'
+
+    def _content_types(self) -> bytes:
+        types = self.template.parts[CONTENT_TYPES_PART].decode('utf-8')
+        defaults = dict(DEFAULT_TYPE_RE.findall(types))
+        overrides = []
+        for image, (partname, _) in self._media.items():
+            ext = partname.rsplit('.', 1)[1]
+            if (ext.lower(), image.content_type) in default_content_types:
+                defaults[ext] = image.content_type
+            else:
+                overrides.append((f"/{partname}", image.content_type))
+        # Defaults come first, sorted by extension, as python-docx writes them
+        types = DEFAULT_TYPE_RE.sub('', types)
+        start = types.index('>', types.index('<Types')) + 1
+        end = types.rindex('</Types>')
+        types = (types[:start]
+                 + ''.join(f'<Default Extension="{ext}" ContentType="{ct}"/>'
+                           for ext, ct in sorted(defaults.items()))
+                 + types[start:end]
+                 + ''.join(f'<Override PartName="{name}" ContentType="{ct}"/>'
+                           for name, ct in overrides)
+                 + types[end:])
+        return types.encode('utf-8')
+
+    def _document_rels(self) -> bytes:
+        rels = self.template.parts[DOCUMENT_RELS_PART].decode('utf-8')
+        added = ''.join(
+            f'<Relationship Id="{rId}" Type="{RT.IMAGE}" Target="{partname[len("word/"):]}"/>'
+            for partname, rId in self._media.values()
+        )
+        return rels.replace('</Relationships>', added + '</Relationships>').encode('utf-8')
+
+    def save(self):
+        """Finish the package and move it into place."""
+        self.write(self.template.tail)
+        self._flush()
+        self._stream.close()
+
+        writer = self._writer
+        header = _fill(self.template.parts[HEADER_PART].decode('utf-8'), 'Title', self.title)
+        for name, data in self.template.parts.items():
+            if name == CONTENT_TYPES_PART:
+                data = self._content_types()
+            elif name == DOCUMENT_RELS_PART:
+                data = self._document_rels()
+            elif name == HEADER_PART:
+                data = header.encode('utf-8')
+            elif name == DOCUMENT_PART:
+                continue
+            writer.write(name, data)
+        for image, (partname, _) in self._media.items():
+            writer.write(partname, image.blob)
+        writer.commit()
+
+    def discard(self):
+        """Abandon the package; nothing is written to the output path."""
+        try:
+            self._stream.close()
+        finally:
+            self._writer.discard()
+
+
+# ---------------------------------------------------------------------------
+# Renderer
+# ---------------------------------------------------------------------------
+
+def add_screenshot_placeholder(doc: StreamDocument, description: str):
+    ppr = ('<w:spacing w:before="240" w:after="240"/><w:jc w:val="center"/>'
+           + fragment_markup(PLACEHOLDER_BORDER_XML)
+           + fragment_markup(SHADING_XML.format('F5F5F5')))
+    doc.add_paragraph(run(f"📷 SCREENSHOT: {description}", PLACEHOLDER_RPR), ppr)
+
+
+def add_embedded_image(doc: StreamDocument, image_path: str, alt_text: str) -> int:
+    """Add an image scaled to the page, as generate_docx.add_embedded_image does."""
+    try:
+        info = image_pipeline.image_info(image_path)
+        aspect = info['height'] / info['width']
+        width = min(5.5, 7.0 / aspect) if aspect > 0 else 5.5
+        embedded = image_pipeline.prepare_image(image_path, width)
+        picture = doc.picture_run(embedded, width)
+    except Exception:
+        # Fall back to default sizing
+        embedded = image_path
+        try:
+            picture = doc.picture_run(image_path, 5.5)
+        except Exception:
+            doc.add_paragraph(ppr=IMAGE_PPR)
+            add_screenshot_placeholder(doc, f"{alt_text} (image not found)")
+            return 0
+
+    doc.add_paragraph(picture, IMAGE_PPR)
+    doc.add_paragraph(run(alt_text), paragraph_style(doc.style_id('Caption')))
+    return os.path.getsize(embedded)
+
+
+def add_styled_table(doc: StreamDocument, headers: list, rows: list):
+    cols = len(headers)
+    width = doc.template.column_width(cols)
+    cell_start = (f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+                  f'<w:p><w:pPr>{paragraph_style(doc.style_id("Table Text"))}</w:pPr>')
+    cell_end = '</w:p></w:tc>'
+
+    def row_xml(values, rpr=''):
+        cells = [cell_start + run(str(value), rpr) + cell_end for value in values[:cols]]
+        cells += [cell_start + cell_end] * (cols - len(cells))
+        return '<w:tr>' + ''.join(cells) + '</w:tr>'
+
+    doc.write('<w:tbl>' + TABLE_PROPERTIES.format(doc.style_id('Light Grid Accent 1'))
+              + '<w:tblGrid>' + f'<w:gridCol w:w="{width}"/>' * cols + '</w:tblGrid>')
+    doc.write(row_xml(headers, BOLD_RPR))
+    for row_data in rows:
+        doc.write(row_xml(row_data))
+    doc.write('</w:tbl>')
+    # Spacing after table
+    doc.add_paragraph()
+
+
+def add_code_block(doc: StreamDocument, lines: list, compact: bool = False):
+    ppr = paragraph_style(doc.style_id('Code Block'))
+    if compact:
+        if not lines:
+            return
+        lines = ['\n'.join(lines)]
+    for line in lines:
+        doc.add_paragraph(run(line) if line else '', ppr)
+
+
+def render_token(doc: StreamDocument, token, md_dir: Path, compact_code: bool) -> int:
+    """Render one block token; return the image bytes it embedded."""
+    kind = type(token)
+    if kind is Paragraph:
+        doc.add_paragraph(formatted_runs(token.text, doc.style_id('Code Char')))
+    elif kind is ListItem:
+        style = doc.style_id('List Number' if token.ordered else 'List Bullet')
+        doc.add_paragraph(formatted_runs(token.text, doc.style_id('Code Char')),
+                          paragraph_style(style))
+    elif kind is Heading:
+        style = doc.style_id(f'Heading {token.level}')
+        doc.add_paragraph(run(token.text) if token.text else '', paragraph_style(style))
+    elif kind is CodeBlock:
+        add_code_block(doc, token.lines, compact=compact_code)
+    elif kind is Table:
+        add_styled_table(doc, token.headers, token.rows)
+    elif kind is Image:
+        img_abs_path = (md_dir / token.path).resolve()
+        if img_abs_path.exists():
+            return add_embedded_image(doc, str(img_abs_path), token.alt)
+        add_screenshot_placeholder(doc, token.alt)
+    elif kind is Screenshot:
+        add_screenshot_placeholder(doc, token.description)
+    return 0
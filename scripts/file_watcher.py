@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Wait for files under a directory tree to change.
+
+On Linux the kernel's inotify interface is used directly (through ctypes, so
+no extra package is needed): changes are reported as soon as a file is
+closed after writing or renamed into place. Elsewhere, or if inotify is
+unavailable, the tree is polled for modification-time and size changes.
+
+Both watchers report changed paths that satisfy an include predicate, after
+a short debounce so an editor's write-then-rename counts as one change.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# Collect further events until the tree has been quiet this long
+DEBOUNCE = 0.05
+POLL_INTERVAL = 0.5
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _walk_files(root: Path, include):
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            if include(path):
+                yield path
+
+
+class InotifyWatcher:
+    kind = 'inotify'
+
+    def __init__(self, root, include):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        # AttributeError here (no inotify in this libc) makes open_watcher poll
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = Path(root)
+        self.include = include
+        self._dirs = {}     # watch descriptor -> directory
+        for dirpath, _, _ in os.walk(self.root):
+            self._watch_dir(Path(dirpath))
+
+    def _watch_dir(self, path: Path):
+        wd = self._add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _read(self, timeout) -> set:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report everything
+                return set(_walk_files(self.root, self.include))
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for dirpath, _, _ in os.walk(path):
+                        self._watch_dir(Path(dirpath))
+                    changed.update(_walk_files(path, self.include))
+            elif self.include(path):
+                changed.add(path)
+        return changed
+
+    def wait(self) -> set:
+        """Block until some included file changes; return the changed paths."""
+        changed = set()
+        while not changed:
+            changed = self._read(None)
+        while True:
+            more = self._read(DEBOUNCE)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    kind = 'polling'
+
+    def __init__(self, root, include, interval: float = POLL_INTERVAL):
+        self.root = Path(root)
+        self.include = include
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict:
+        snapshot = {}
+        for path in _walk_files(self.root, self.include):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self) -> set:
+        """Block until some included file changes; return the changed paths."""
+        while True:
+            time.sleep(self.interval)
+            current = self._scan()
+            changed = {path for path in current.keys() | self._snapshot.keys()
+                       if current.get(path) != self._snapshot.get(path)}
+            self._snapshot = current
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(root, include, poll: bool = False):
+    """Return an inotify watcher for root, or a polling one if unavailable."""
+    if not poll:
+        try:
+            return InotifyWatcher(root, include)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, include)
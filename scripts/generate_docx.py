@@ -10,75 +10,144 @@ Converts markdown files to properly formatted .docx files with:
 - Professional formatting for Google Docs compatibility
 """
 
-import re
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
 import sys
+import time
+import weakref
+from copy import deepcopy
+from datetime import date
 from pathlib import Path
 
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.section import WD_ORIENT
+from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn, nsdecls
 from docx.oxml import parse_xml
-
-
-def create_styled_document(title: str, subtitle: str = "") -> Document:
-    """Create a new document with professional styling."""
+from docx.oxml.shape import CT_Inline
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import PackURI
+from docx.parts.image import ImagePart
+
+# Bump GENERATOR_VERSION (in build_settings.py) whenever a change here alters
+# the generated .docx output, so incremental builds rebuild everything.
+from build_settings import CACHE_DIR, GENERATOR_VERSION, write_atomic
+from docx_package import COMPRESSLEVEL, save_document
+import image_pipeline
+from markdown_blocks import (
+    CodeBlock, Heading, Image, ListItem, Paragraph, Screenshot, Table,
+    inline_runs, referenced_images, tokenize,
+)
+
+@functools.lru_cache(maxsize=None)
+def _parsed_fragment(xml: str):
+    return parse_xml(xml)
+
+
+def xml_fragment(xml: str):
+    """Return a fresh element for an XML snippet, parsing each snippet once.
+
+    Snippets must declare their namespaces (e.g. via nsdecls('w')).
+    """
+    return deepcopy(_parsed_fragment(xml))
+
+
+SHADING_XML = '<w:shd {} w:fill="{{}}" w:val="clear"/>'.format(nsdecls('w'))
+PLACEHOLDER_BORDER_XML = (
+    '<w:pBdr {}>'
+    '  <w:top w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
+    '  <w:left w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
+    '  <w:bottom w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
+    '  <w:right w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
+    '</w:pBdr>'.format(nsdecls('w'))
+)
+
+
+# Style settings baked into the base template; any change here produces a
+# new template cache key.
+DOCUMENT_STYLES = {
+    'Normal': {'font': 'Calibri', 'size': 11, 'color': '333333'},
+    'Heading 1': {'size': 24, 'color': '1A5676', 'bold': True, 'space_before': 24, 'space_after': 12},
+    'Heading 2': {'size': 18, 'color': '2E7496', 'bold': True, 'space_before': 18, 'space_after': 8},
+    'Heading 3': {'size': 14, 'color': '3D85A8', 'bold': True, 'space_before': 12, 'space_after': 6},
+    'Caption': {'size': 9, 'color': '666666', 'bold': False, 'italic': True, 'center': True},
+    # Custom styles, created (on top of their base style, if any)
+    'Table Text': {'base': 'Normal', 'size': 10},
+    'Code Block': {'base': 'Normal', 'font': 'Courier New', 'size': 9, 'shading': 'F5F5F5'},
+    'Code Char': {'type': 'character', 'font': 'Courier New', 'size': 10},
+}
+
+# In-memory copy of the base template for this process
+_template_bytes = None
+
+
+def _template_key() -> str:
+    settings = json.dumps([GENERATOR_VERSION, DOCUMENT_STYLES], sort_keys=True)
+    return hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]
+
+
+def _build_template() -> Document:
+    """Build the styled base document with placeholder title-page text.
+
+    The first three body paragraphs are the title, subtitle and date, each
+    holding a single run that create_styled_document fills in.
+    """
     doc = Document()
 
-    # Set default font
-    style = doc.styles['Normal']
-    font = style.font
-    font.name = 'Calibri'
-    font.size = Pt(11)
-    font.color.rgb = RGBColor(0x33, 0x33, 0x33)
-
-    # Style Heading 1
-    h1 = doc.styles['Heading 1']
-    h1.font.size = Pt(24)
-    h1.font.color.rgb = RGBColor(0x1a, 0x56, 0x76)
-    h1.font.bold = True
-    h1.paragraph_format.space_before = Pt(24)
-    h1.paragraph_format.space_after = Pt(12)
-
-    # Style Heading 2
-    h2 = doc.styles['Heading 2']
-    h2.font.size = Pt(18)
-    h2.font.color.rgb = RGBColor(0x2e, 0x74, 0x96)
-    h2.font.bold = True
-    h2.paragraph_format.space_before = Pt(18)
-    h2.paragraph_format.space_after = Pt(8)
-
-    # Style Heading 3
-    h3 = doc.styles['Heading 3']
-    h3.font.size = Pt(14)
-    h3.font.color.rgb = RGBColor(0x3d, 0x85, 0xa8)
-    h3.font.bold = True
-    h3.paragraph_format.space_before = Pt(12)
-    h3.paragraph_format.space_after = Pt(6)
+    # Apply style settings
+    for style_name, settings in DOCUMENT_STYLES.items():
+        if style_name in doc.styles:
+            style = doc.styles[style_name]
+        else:
+            style_type = (WD_STYLE_TYPE.CHARACTER if settings.get('type') == 'character'
+                          else WD_STYLE_TYPE.PARAGRAPH)
+            style = doc.styles.add_style(style_name, style_type)
+            if 'base' in settings:
+                style.base_style = doc.styles[settings['base']]
+        font = style.font
+        if 'font' in settings:
+            font.name = settings['font']
+        font.size = Pt(settings['size'])
+        if 'color' in settings:
+            font.color.rgb = RGBColor.from_string(settings['color'])
+        if 'bold' in settings:
+            font.bold = settings['bold']
+        if 'italic' in settings:
+            font.italic = settings['italic']
+        if settings.get('center'):
+            style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        if 'shading' in settings:
+            style.element.get_or_add_pPr().append(xml_fragment(SHADING_XML.format(settings['shading'])))
+        if 'space_before' in settings:
+            style.paragraph_format.space_before = Pt(settings['space_before'])
+            style.paragraph_format.space_after = Pt(settings['space_after'])
 
     # Title page
     title_para = doc.add_paragraph()
     title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
     title_para.paragraph_format.space_before = Pt(120)
-    run = title_para.add_run(title)
+    run = title_para.add_run('Title')
     run.font.size = Pt(36)
     run.font.color.rgb = RGBColor(0x1a, 0x56, 0x76)
     run.bold = True
 
-    if subtitle:
-        sub_para = doc.add_paragraph()
-        sub_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = sub_para.add_run(subtitle)
-        run.font.size = Pt(16)
-        run.font.color.rgb = RGBColor(0x66, 0x66, 0x66)
+    sub_para = doc.add_paragraph()
+    sub_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = sub_para.add_run('Subtitle')
+    run.font.size = Pt(16)
+    run.font.color.rgb = RGBColor(0x66, 0x66, 0x66)
 
     # Add date
-    from datetime import date
     date_para = doc.add_paragraph()
     date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
     date_para.paragraph_format.space_before = Pt(24)
-    run = date_para.add_run(f"Generated: {date.today().strftime('%B %d, %Y')}")
+    run = date_para.add_run('Generated:')
     run.font.size = Pt(12)
     run.font.color.rgb = RGBColor(0x99, 0x99, 0x99)
 
@@ -112,9 +181,9 @@ def create_styled_document(title: str, subtitle: str = "") -> Document:
     section = doc.sections[0]
     header = section.header
     header_para = header.paragraphs[0]
-    header_para.text = title
+    header_para.text = 'Title'
     header_para.style = doc.styles['Normal']
-    header_run = header_para.runs[0] if header_para.runs else header_para.add_run(title)
+    header_run = header_para.runs[0]
     header_run.font.size = Pt(9)
     header_run.font.color.rgb = RGBColor(0x99, 0x99, 0x99)
 
@@ -139,6 +208,64 @@ def create_styled_document(title: str, subtitle: str = "") -> Document:
     return doc
 
 
+def load_template() -> bytes:
+    """Return the base template, building and caching it on disk if needed."""
+    global _template_bytes
+    if _template_bytes is None:
+        path = CACHE_DIR / f"template-{_template_key()}.docx"
+        try:
+            _template_bytes = path.read_bytes()
+        except OSError:
+            buf = io.BytesIO()
+            _build_template().save(buf)
+            _template_bytes = buf.getvalue()
+            # Parallel workers may all build it; each renames a complete file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, _template_bytes)
+    return _template_bytes
+
+
+def create_styled_document(title: str, subtitle: str = "") -> Document:
+    """Create a new document with professional styling."""
+    doc = Document(io.BytesIO(load_template()))
+
+    # Fill in the title page placeholders
+    title_para, sub_para, date_para = doc.paragraphs[:3]
+    title_para.runs[0].text = title
+    if subtitle:
+        sub_para.runs[0].text = subtitle
+    else:
+        sub_para._p.getparent().remove(sub_para._p)
+    date_para.runs[0].text = f"Generated: {date.today().strftime('%B %d, %Y')}"
+
+    doc.sections[0].header.paragraphs[0].runs[0].text = title
+
+    return doc
+
+
+# Style name -> style id; every document starts from the same template
+_style_ids = {}
+
+
+def style_id(doc: Document, name: str) -> str:
+    """Return the id of a named style, resolving each name once per process.
+
+    Assigning a style by name makes python-docx scan every style in the
+    document to resolve it, which used to dominate rendering time.
+    """
+    sid = _style_ids.get(name)
+    if sid is None:
+        sid = _style_ids[name] = doc.styles[name].style_id
+    return sid
+
+
+def add_styled_paragraph(doc: Document, text: str, style: str):
+    """Like doc.add_paragraph(text, style), with the style applied by id."""
+    para = doc.add_paragraph(text)
+    para._p.style = style_id(doc, style)
+    return para
+
+
 def add_screenshot_placeholder(doc: Document, description: str):
     """Add a styled screenshot placeholder."""
     para = doc.add_paragraph()
@@ -148,19 +275,10 @@ def add_screenshot_placeholder(doc: Document, description: str):
 
     # Add border styling via XML
     pPr = para._p.get_or_add_pPr()
-    pBdr = parse_xml(
-        '<w:pBdr {}>'
-        '  <w:top w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
-        '  <w:left w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
-        '  <w:bottom w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
-        '  <w:right w:val="single" w:sz="4" w:space="8" w:color="CCCCCC"/>'
-        '</w:pBdr>'.format(nsdecls('w'))
-    )
-    pPr.append(pBdr)
+    pPr.append(xml_fragment(PLACEHOLDER_BORDER_XML))
 
     # Shading
-    shd = parse_xml('<w:shd {} w:fill="F5F5F5" w:val="clear"/>'.format(nsdecls('w')))
-    pPr.append(shd)
+    pPr.append(xml_fragment(SHADING_XML.format('F5F5F5')))
 
     run = para.add_run(f"📷 SCREENSHOT: {description}")
     run.font.size = Pt(10)
@@ -168,9 +286,38 @@ def add_screenshot_placeholder(doc: Document, description: str):
     run.font.italic = True
 
 
-def add_embedded_image(doc: Document, image_path: str, alt_text: str):
-    """Add an actual image to the document, scaled to fit within page width."""
-    from PIL import Image as PILImage
+# Package -> {image: ImagePart} for images already embedded in that document
+_package_media = weakref.WeakKeyDictionary()
+
+
+def add_pooled_picture(run, image_path: str, width):
+    """Insert an inline picture into run, like run.add_picture().
+
+    The image comes from the process-wide media pool, and each pooled image
+    gets one part per document, found by identity. run.add_picture() instead
+    re-reads and re-hashes the file, then SHA-1s every image part already in
+    the document to look for a duplicate.
+    """
+    image = image_pipeline.pooled_image(image_path)
+    part = run.part
+    package = part.package
+    parts = _package_media.setdefault(package, {})
+    image_part = parts.get(image)
+    if image_part is None:
+        image_parts = package.image_parts
+        partname = PackURI(f"/word/media/image{len(image_parts) + 1}.{image.ext}")
+        image_part = parts[image] = ImagePart.from_image(image, partname)
+        image_parts.append(image_part)
+    rId = part.relate_to(image_part, RT.IMAGE)
+    cx, cy = image.scaled_dimensions(width, None)
+    run._r.add_drawing(CT_Inline.new_pic_inline(part.next_id, rId, image.filename, cx, cy))
+
+
+def add_embedded_image(doc: Document, image_path: str, alt_text: str) -> int:
+    """Add an actual image to the document, scaled to fit within page width.
+
+    Returns the number of image bytes embedded (0 if a placeholder was used).
+    """
 
     para = doc.add_paragraph()
     para.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -179,29 +326,28 @@ def add_embedded_image(doc: Document, image_path: str, alt_text: str):
 
     # Get image dimensions to calculate appropriate width
     try:
-        with PILImage.open(image_path) as img:
-            w, h = img.size
-            aspect = h / w
-            # Max width 5.5 inches (leaving margins), max height 7 inches
-            width = min(5.5, 7.0 / aspect) if aspect > 0 else 5.5
-            run = para.add_run()
-            run.add_picture(image_path, width=Inches(width))
+        info = image_pipeline.image_info(image_path)
+        w, h = info['width'], info['height']
+        aspect = h / w
+        # Max width 5.5 inches (leaving margins), max height 7 inches
+        width = min(5.5, 7.0 / aspect) if aspect > 0 else 5.5
+        # Embed a copy downscaled to the displayed size, not the original
+        embedded = image_pipeline.prepare_image(image_path, width)
+        run = para.add_run()
+        add_pooled_picture(run, embedded, Inches(width))
     except Exception as e:
         # Fall back to default sizing
+        embedded = image_path
         run = para.add_run()
         try:
-            run.add_picture(image_path, width=Inches(5.5))
+            add_pooled_picture(run, image_path, Inches(5.5))
         except Exception:
             add_screenshot_placeholder(doc, f"{alt_text} (image not found)")
-            return
+            return 0
 
     # Caption below image
-    caption = doc.add_paragraph()
-    caption.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    cap_run = caption.add_run(alt_text)
-    cap_run.font.size = Pt(9)
-    cap_run.font.color.rgb = RGBColor(0x66, 0x66, 0x66)
-    cap_run.font.italic = True
+    add_styled_paragraph(doc, alt_text, 'Caption')
+    return os.path.getsize(embedded)
 
 
 def add_info_box(doc: Document, text: str, box_type: str = "info"):
@@ -219,35 +365,47 @@ def add_info_box(doc: Document, text: str, box_type: str = "info"):
     para.paragraph_format.space_after = Pt(8)
 
     pPr = para._p.get_or_add_pPr()
-    shd = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{bg}" w:val="clear"/>')
-    pPr.append(shd)
+    pPr.append(xml_fragment(SHADING_XML.format(bg)))
 
     run = para.add_run(f"{icon} {text}")
     run.font.size = Pt(10)
 
 
+BOLD_RPR_XML = '<w:rPr {}><w:b/></w:rPr>'.format(nsdecls('w'))
+TABLE_TEXT_PPR_XML = '<w:pPr {}><w:pStyle w:val="TableText"/></w:pPr>'.format(nsdecls('w'))
+
+
+def _fill_row(tr, values, bold: bool = False):
+    """Write one text run per cell of a bare table row element."""
+    for tc, value in zip(tr.tc_lst, values):
+        r = tc.p_lst[0].add_r()
+        r.text = str(value)
+        if bold:
+            r.insert(0, xml_fragment(BOLD_RPR_XML))
+    return tr
+
+
 def add_styled_table(doc: Document, headers: list, rows: list):
-    """Add a professionally styled table."""
-    table = doc.add_table(rows=1 + len(rows), cols=len(headers))
-    table.style = 'Light Grid Accent 1'
+    """Add a professionally styled table.
+
+    Rows are built directly as XML from a blank row template rather than
+    through table.rows[r].cells[c], which rebuilds the cell grid on every
+    access. The 10pt size comes from the 'Table Text' paragraph style.
+    """
+    table = doc.add_table(rows=1, cols=len(headers))
+    tbl = table._tbl
+    tbl.tblStyle_val = style_id(doc, 'Light Grid Accent 1')
+    blank = tbl.tr_lst[0]
+    tbl.remove(blank)
+    for tc in blank.tc_lst:
+        tc.p_lst[0].insert(0, xml_fragment(TABLE_TEXT_PPR_XML))
 
     # Header row
-    for i, header in enumerate(headers):
-        cell = table.rows[0].cells[i]
-        cell.text = header
-        for paragraph in cell.paragraphs:
-            for run in paragraph.runs:
-                run.font.bold = True
-                run.font.size = Pt(10)
+    tbl.append(_fill_row(deepcopy(blank), headers, bold=True))
 
     # Data rows
-    for row_idx, row_data in enumerate(rows):
-        for col_idx, cell_text in enumerate(row_data):
-            cell = table.rows[row_idx + 1].cells[col_idx]
-            cell.text = str(cell_text)
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.font.size = Pt(10)
+    for row_data in rows:
+        tbl.append(_fill_row(deepcopy(blank), row_data))
 
     # Add spacing after table
     doc.add_paragraph()
@@ -255,179 +413,184 @@ def add_styled_table(doc: Document, headers: list, rows: list):
     return table
 
 
-def md_to_docx(md_path: str, docx_path: str, title: str, subtitle: str = ""):
-    """Convert a markdown file to a styled .docx document."""
-    md_content = Path(md_path).read_text(encoding='utf-8')
-
-    doc = create_styled_document(title, subtitle)
-
-    lines = md_content.split('\n')
-    i = 0
-    in_code_block = False
-    in_table = False
-    table_rows = []
-    table_headers = []
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Code blocks
-        if line.strip().startswith('```'):
-            in_code_block = not in_code_block
-            i += 1
-            continue
-
-        if in_code_block:
-            para = doc.add_paragraph(line)
-            para.style = doc.styles['Normal']
-            for run in para.runs:
-                run.font.name = 'Courier New'
-                run.font.size = Pt(9)
-            pPr = para._p.get_or_add_pPr()
-            shd = parse_xml(f'<w:shd {nsdecls("w")} w:fill="F5F5F5" w:val="clear"/>')
-            pPr.append(shd)
-            i += 1
-            continue
-
-        # Tables
-        if '|' in line and line.strip().startswith('|'):
-            cells = [c.strip() for c in line.strip().strip('|').split('|')]
-
-            if not in_table:
-                # Check if next line is separator
-                if i + 1 < len(lines) and re.match(r'\|[\s\-:|]+\|', lines[i + 1].strip()):
-                    table_headers = cells
-                    in_table = True
-                    table_rows = []
-                    i += 2  # Skip header and separator
-                    continue
-            else:
-                if cells and any(c for c in cells):
-                    table_rows.append(cells)
-                else:
-                    # End of table
-                    if table_headers and table_rows:
-                        add_styled_table(doc, table_headers, table_rows)
-                    in_table = False
-                    table_headers = []
-                    table_rows = []
-                i += 1
-                continue
-        elif in_table:
-            # End of table (non-table line encountered)
-            if table_headers and table_rows:
-                add_styled_table(doc, table_headers, table_rows)
-            in_table = False
-            table_headers = []
-            table_rows = []
-            # Don't increment - process this line normally
-            continue
-
-        # Empty line
-        if not line.strip():
-            i += 1
-            continue
-
-        # Markdown images: ![alt](path)
-        img_match = re.match(r'!\[(.+?)\]\((.+?)\)', line.strip())
-        if img_match:
-            alt_text = img_match.group(1)
-            img_rel_path = img_match.group(2)
-            # Resolve path relative to the markdown file
-            md_dir = Path(md_path).parent
-            img_abs_path = (md_dir / img_rel_path).resolve()
-            if img_abs_path.exists():
-                add_embedded_image(doc, str(img_abs_path), alt_text)
-            else:
-                add_screenshot_placeholder(doc, alt_text)
-            i += 1
-            continue
-
-        # Screenshot placeholders
-        screenshot_match = re.match(r'\[SCREENSHOT:\s*(.+?)\]', line.strip())
-        if screenshot_match:
-            add_screenshot_placeholder(doc, screenshot_match.group(1))
-            i += 1
-            continue
-
-        # Headers
-        if line.startswith('# '):
-            doc.add_heading(line[2:].strip(), level=1)
-            i += 1
-            continue
-        if line.startswith('## '):
-            doc.add_heading(line[3:].strip(), level=2)
-            i += 1
-            continue
-        if line.startswith('### '):
-            doc.add_heading(line[4:].strip(), level=3)
-            i += 1
-            continue
-        if line.startswith('#### '):
-            doc.add_heading(line[5:].strip(), level=4)
-            i += 1
-            continue
-
-        # Numbered lists
-        num_match = re.match(r'^(\d+)\.\s+(.+)', line)
-        if num_match:
-            para = doc.add_paragraph(style='List Number')
-            _add_formatted_text(para, num_match.group(2))
-            i += 1
-            continue
-
-        # Bullet lists
-        if line.strip().startswith('- ') or line.strip().startswith('* '):
-            text = re.sub(r'^[\s]*[-*]\s+', '', line)
-            para = doc.add_paragraph(style='List Bullet')
-            _add_formatted_text(para, text)
-            i += 1
-            continue
-
-        # Regular paragraph
-        para = doc.add_paragraph()
-        _add_formatted_text(para, line)
-        i += 1
+# ---------------------------------------------------------------------------
+# Renderer
+# ---------------------------------------------------------------------------
+
+def add_code_block(doc: Document, lines: list, compact: bool = False):
+    """Add a fenced code block as shaded monospace text.
+
+    By default each line is its own 'Code Block' paragraph. With
+    compact=True the whole block is a single paragraph with line breaks,
+    which emits far fewer document elements for long listings.
+    """
+    if compact:
+        if not lines:
+            return
+        lines = ['\n'.join(lines)]
+    for line in lines:
+        add_styled_paragraph(doc, line, 'Code Block')
 
-    # Flush any remaining table
-    if in_table and table_headers and table_rows:
-        add_styled_table(doc, table_headers, table_rows)
 
-    doc.save(docx_path)
+def _render_token(doc: Document, token, md_dir: Path, compact_code: bool) -> int:
+    """Render one block token; return the image bytes it embedded."""
+    kind = type(token)
+    if kind is Paragraph:
+        para = doc.add_paragraph()
+        _add_formatted_text(para, token.text)
+    elif kind is ListItem:
+        para = add_styled_paragraph(doc, '', 'List Number' if token.ordered else 'List Bullet')
+        _add_formatted_text(para, token.text)
+    elif kind is Heading:
+        add_styled_paragraph(doc, token.text, f'Heading {token.level}')
+    elif kind is CodeBlock:
+        add_code_block(doc, token.lines, compact=compact_code)
+    elif kind is Table:
+        add_styled_table(doc, token.headers, token.rows)
+    elif kind is Image:
+        img_abs_path = (md_dir / token.path).resolve()
+        if img_abs_path.exists():
+            return add_embedded_image(doc, str(img_abs_path), token.alt)
+        add_screenshot_placeholder(doc, token.alt)
+    elif kind is Screenshot:
+        add_screenshot_placeholder(doc, token.description)
+    return 0
+
+
+def render_tokens(doc: Document, tokens, md_dir: Path, compact_code: bool = False,
+                  profile: dict = None, render_token=_render_token):
+    """Render a block token stream into doc; image paths resolve from md_dir.
+
+    With a profile dict (see md_to_docx), time and count each element kind.
+    render_token(doc, token, md_dir, compact_code) renders a single token;
+    the streaming backend passes its own.
+    """
+    if profile is None:
+        for token in tokens:
+            render_token(doc, token, md_dir, compact_code)
+        return
+
+    stages, counts = profile['stages'], profile['counts']
+    for token in tokens:
+        kind = type(token).__name__
+        start = time.perf_counter()
+        profile['image_bytes'] += render_token(doc, token, md_dir, compact_code)
+        stages[kind] = stages.get(kind, 0.0) + time.perf_counter() - start
+        counts[kind] = counts.get(kind, 0) + 1
+
+
+def new_profile() -> dict:
+    """Empty per-document profile, filled in by md_to_docx(profile=...).
+
+    stages maps a stage ('template', 'parse' (reading and tokenizing, which
+    are interleaved), one per element kind such as 'Table' or 'Image',
+    'save') to wall seconds; counts maps each element kind to the number
+    emitted.
+    """
+    return {'stages': {}, 'counts': {}, 'image_bytes': 0, 'output_bytes': 0, 'total': 0.0}
+
+
+def open_markdown(md_path: str):
+    """Open a markdown source for streaming; '-' means standard input."""
+    if md_path == '-':
+        return contextlib.nullcontext(sys.stdin)
+    return open(md_path, encoding='utf-8')
+
+
+BACKENDS = ('python-docx', 'stream')
+
+
+def md_to_docx(md_path: str, docx_path: str, title: str, subtitle: str = "",
+               compact_code: bool = False, profile: dict = None,
+               backend: str = 'python-docx', compresslevel: int = COMPRESSLEVEL):
+    """Convert a markdown file to a styled .docx document.
+
+    The source is streamed line by line rather than read whole; md_path may
+    be '-' for standard input, in which case images resolve from the current
+    directory. compact_code renders each fenced code block as one paragraph.
+    If profile is a dict from new_profile(), per-stage timings, element
+    counts, embedded image bytes and the output size are recorded in it.
+
+    backend 'stream' writes the document XML directly (see docx_stream.py)
+    instead of building it through python-docx; the output is the same.
+    compresslevel is the zlib level for the XML parts (see docx_package.py);
+    the output file only appears once it is complete.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend!r}")
+    start = mark = time.perf_counter()
+
+    def lap(stage):
+        nonlocal mark
+        if profile is not None:
+            now = time.perf_counter()
+            profile['stages'][stage] = profile['stages'].get(stage, 0.0) + now - mark
+            mark = now
+
+    if backend == 'stream':
+        import docx_stream
+        doc = docx_stream.StreamDocument(docx_path, title, subtitle, compresslevel)
+        render_token = docx_stream.render_token
+    else:
+        doc = create_styled_document(title, subtitle)
+        render_token = _render_token
+    lap('template')
+    md_dir = Path.cwd() if md_path == '-' else Path(md_path).parent
+    try:
+        with open_markdown(md_path) as source:
+            tokens = tokenize(source)
+            if profile is not None:
+                # Tokenize up front so parsing is timed apart from rendering
+                tokens = list(tokens)
+            lap('parse')
+            render_tokens(doc, tokens, md_dir, compact_code, profile, render_token)
+        mark = time.perf_counter()
+        if backend == 'stream':
+            doc.save()
+        else:
+            save_document(doc, docx_path, compresslevel)
+    except BaseException:
+        if backend == 'stream':
+            # Remove the partly written package
+            doc.discard()
+        raise
+    lap('save')
+
+    if profile is not None:
+        profile['total'] += mark - start
+        profile['output_bytes'] = os.path.getsize(docx_path)
+
     print(f"Generated: {docx_path}")
 
+    image_pipeline.save_image_index()
+
 
 def _add_formatted_text(para, text: str):
-    """Add text with bold/italic formatting to a paragraph."""
-    # Process bold and italic markers
-    parts = re.split(r'(\*\*[^*]+\*\*|\*[^*]+\*|`[^`]+`)', text)
-
-    for part in parts:
-        if not part:
-            continue
-        if part.startswith('**') and part.endswith('**'):
-            run = para.add_run(part[2:-2])
+    """Add text with bold/italic/code formatting to a paragraph.
+
+    Adjacent text with the same formatting is already a single run spec, so
+    each run here differs from its neighbours.
+    """
+    for spec in inline_runs(text):
+        run = para.add_run(spec.text)
+        if spec.code:
+            run._r.style = style_id(para.part.document, 'Code Char')
+        if spec.bold:
             run.bold = True
-        elif part.startswith('*') and part.endswith('*'):
-            run = para.add_run(part[1:-1])
+        if spec.italic:
             run.italic = True
-        elif part.startswith('`') and part.endswith('`'):
-            run = para.add_run(part[1:-1])
-            run.font.name = 'Courier New'
-            run.font.size = Pt(10)
-            # Light background for inline code
-        else:
-            para.add_run(part)
 
 
 if __name__ == '__main__':
     if len(sys.argv) < 3:
-        print("Usage: generate_docx.py <input.md> <output.docx> [title] [subtitle]")
+        print("Usage: generate_docx.py <input.md|-> <output.docx> [title] [subtitle]")
         sys.exit(1)
 
     md_file = sys.argv[1]
     docx_file = sys.argv[2]
-    title = sys.argv[3] if len(sys.argv) > 3 else Path(md_file).stem.replace('-', ' ').title()
+    # Default title from the input name, or the output name for stdin
+    named = docx_file if md_file == '-' else md_file
+    title = sys.argv[3] if len(sys.argv) > 3 else Path(named).stem.replace('-', ' ').title()
     subtitle = sys.argv[4] if len(sys.argv) > 4 else "PreRollTracker & ApexAPI Documentation"
 
     md_to_docx(md_file, docx_file, title, subtitle)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Image preparation for .docx embedding.
+
+Screenshots are resized to the pixel density they are displayed at in the
+document and recompressed, instead of embedding the full-resolution PNG.
+Prepared variants are kept in an on-disk cache keyed by the source's content
+hash and the target size, so repeat builds re-encode nothing.
+
+Image metadata (dimensions, format, byte size, content hash, mtime) is kept
+in a persistent index so each file is opened and hashed at most once, and
+only again when its size or mtime changes.
+
+Within one process, every document embeds images from a shared media pool:
+each file is read, hashed and parsed once, however many times and in however
+many documents it is referenced.
+"""
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+from build_settings import CACHE_DIR, write_atomic
+
+VARIANT_DIR = CACHE_DIR / 'images'
+INDEX_PATH = CACHE_DIR / 'image-index.json'
+
+# Pixels per inch of displayed width; sharp on screen and adequate in print
+TARGET_DPI = 150
+
+# JPEG is used only when it is meaningfully smaller than the optimized PNG
+# and its mean per-channel error against the resized image stays below this
+JPEG_QUALITY = 85
+JPEG_MAX_ERROR = 2.0
+JPEG_MIN_SAVING = 0.8
+
+# Part of every cache key; bump when the encoding settings above change
+PIPELINE_VERSION = "1"
+
+
+def source_hash(image_path: str) -> str:
+    """SHA-256 of an image file's contents."""
+    h = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Absolute path -> metadata dict; loaded lazily from INDEX_PATH
+_index = None
+# Keys added or refreshed since the index was last saved
+_index_updates = set()
+
+
+def _read_index() -> dict:
+    try:
+        with open(INDEX_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _load_index() -> dict:
+    global _index
+    if _index is None:
+        _index = _read_index()
+    return _index
+
+
+def image_info(image_path: str) -> dict:
+    """Return cached metadata for an image, refreshing it if the file changed.
+
+    Keys: width, height, format, size, sha256, mtime_ns.
+    """
+    index = _load_index()
+    key = os.path.abspath(image_path)
+    st = os.stat(key)
+    info = index.get(key)
+    if info and info['mtime_ns'] == st.st_mtime_ns and info['size'] == st.st_size:
+        return info
+
+    # Pillow is only loaded when an image has to be inspected
+    from PIL import Image as PILImage
+    with PILImage.open(key) as img:
+        width, height = img.size
+        fmt = img.format
+    info = {
+        'width': width,
+        'height': height,
+        'format': fmt,
+        'size': st.st_size,
+        'sha256': source_hash(key),
+        'mtime_ns': st.st_mtime_ns,
+    }
+    index[key] = info
+    _index_updates.add(key)
+    return info
+
+
+def save_image_index():
+    """Persist the image index if any entry was added or refreshed.
+
+    The updated entries are merged into the index as it is on disk now, so
+    parallel builds keep each other's entries except when two saves overlap,
+    in which case the last one wins and any entries it dropped are simply
+    re-inspected later.
+    """
+    global _index
+    if not _index_updates:
+        return
+    index = _read_index()
+    index.update((key, _index[key]) for key in _index_updates)
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(INDEX_PATH, json.dumps(index, indent=1, sort_keys=True).encode('utf-8'))
+    _index = index
+    _index_updates.clear()
+
+
+def target_pixels(width_in: float) -> int:
+    """Pixel width needed to display an image at width_in inches."""
+    return max(1, round(width_in * TARGET_DPI))
+
+
+def _encode(img) -> tuple:
+    """Encode img as optimized PNG or, when acceptable, JPEG; return (data, ext)."""
+    from PIL import Image as PILImage, ImageChops, ImageStat
+
+    png = io.BytesIO()
+    img.save(png, format='PNG', optimize=True)
+    data, ext = png.getvalue(), '.png'
+
+    if img.mode in ('RGB', 'L'):
+        jpg = io.BytesIO()
+        img.save(jpg, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+        if jpg.tell() < len(data) * JPEG_MIN_SAVING:
+            jpg.seek(0)
+            with PILImage.open(jpg) as decoded:
+                diff = ImageChops.difference(img, decoded.convert(img.mode))
+            if max(ImageStat.Stat(diff).mean) <= JPEG_MAX_ERROR:
+                data, ext = jpg.getvalue(), '.jpg'
+    return data, ext
+
+
+# Variant stem -> prepared path, for variants already located this process
+_variants = {}
+
+
+def prepare_image(image_path: str, width_in: float) -> str:
+    """Return the path of a variant of image_path sized for width_in inches."""
+    px = target_pixels(width_in)
+    stem = VARIANT_DIR / f"{image_info(image_path)['sha256']}-{px}-v{PIPELINE_VERSION}"
+    # The cache directory may have been cleared since the variant was located
+    if stem in _variants and os.path.exists(_variants[stem]):
+        return _variants[stem]
+    for ext in ('.png', '.jpg'):
+        cached = stem.with_suffix(ext)
+        if cached.exists():
+            _variants[stem] = str(cached)
+            return _variants[stem]
+
+    from PIL import Image as PILImage
+    VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+    with PILImage.open(image_path) as img:
+        src_format = img.format
+        img.load()
+        if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+        if img.mode in ('RGBA', 'LA') and img.getchannel('A').getextrema() == (255, 255):
+            img = img.convert(img.mode[:-1])
+        if img.width > px:
+            img = img.resize((px, round(img.height * px / img.width)), PILImage.LANCZOS)
+        data, ext = _encode(img)
+
+    if len(data) >= os.path.getsize(image_path):
+        # Recompression did not help; cache the original bytes instead
+        data = Path(image_path).read_bytes()
+        ext = '.jpg' if src_format == 'JPEG' else '.png'
+    dest = stem.with_suffix(ext)
+    write_atomic(dest, data)
+    _variants[stem] = str(dest)
+    return _variants[stem]
+
+
+# Absolute path -> ((mtime_ns, size), docx.image.image.Image holding the
+# file's bytes, SHA-1 and header metadata); shared by every document built in
+# this process. Only the current version of each file is kept, so a long
+# --watch session does not accumulate superseded images.
+_media_pool = {}
+
+
+def pooled_image(image_path: str):
+    """Return the parsed image for image_path, reading the file only once."""
+    st = os.stat(image_path)
+    key = os.path.abspath(image_path)
+    version = (st.st_mtime_ns, st.st_size)
+    entry = _media_pool.get(key)
+    if entry is None or entry[0] != version:
+        from docx.image.image import Image as DocxImage
+        entry = _media_pool[key] = (version, DocxImage.from_file(image_path))
+    return entry[1]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Indexed access to the inventory dataset in docs/data/inventory.jsonl.
+
+Each line is one documented item, identified by (app, kind, path):
+
+    {"app": "PreRollTracker", "kind": "endpoint", "path": "GET /logout",
+     "views": {"inventory": {"seq": 12, "row": [...]},
+               "reference": {"seq": 2, "row": [...]}}}
+
+kind is one of page, endpoint, db_column, job, integration, config or
+model_field. Each view is one output's rendering of the item: "inventory"
+rows feed docs/inventory.xlsx, and "reference" rows feed the workbooks in
+docs/api-reference/. seq orders rows within a view. An item documented in
+several outputs (e.g. an endpoint listed in both workbooks) is a single
+record, so it is edited in one place.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+STORE_PATH = Path(__file__).resolve().parent.parent / 'docs' / 'data' / 'inventory.jsonl'
+
+# (app, kind, path) -> record; loaded lazily
+_index = None
+
+
+def load_index() -> dict:
+    """Return every record keyed by (app, kind, path), in file order."""
+    global _index
+    if _index is None:
+        index = {}
+        with open(STORE_PATH, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = (record['app'], record['kind'], record['path'])
+                if key in index:
+                    raise ValueError(f"{STORE_PATH}:{line_no}: duplicate record {key}")
+                index[key] = record
+        _index = index
+    return _index
+
+
+def query(kind: str, view: str, app: str = None) -> list:
+    """Return the rows of one view for a kind of item, ordered by seq."""
+    matches = [
+        record['views'][view]
+        for (rec_app, rec_kind, _), record in load_index().items()
+        if rec_kind == kind and view in record['views'] and (app is None or rec_app == app)
+    ]
+    return [entry['row'] for entry in sorted(matches, key=lambda entry: entry['seq'])]
+
+
+def view_digest(view: str) -> str:
+    """Hash of every row in one view, with its seq.
+
+    build_docs.py uses this as an input of the outputs a view feeds, so an
+    edit that only touches rows of another view does not rebuild them.
+    """
+    entries = sorted(
+        (key, record['views'][view])
+        for key, record in load_index().items() if view in record['views']
+    )
+    data = json.dumps(entries, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Block and inline tokenizers for the documentation markdown.
+
+Kept apart from generate_docx so that build tooling can find a document's
+images (and tell whether it needs rebuilding) without importing python-docx.
+
+The tokenizer reads its source one line at a time with a single line of
+lookahead, so a file, pipe or stdin is never held in memory as a whole.
+"""
+
+import functools
+import io
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+IMAGE_RE = re.compile(r'!\[(.+?)\]\((.+?)\)')
+
+
+# ---------------------------------------------------------------------------
+# Markdown is tokenized in a single pass into a stream of typed block tokens,
+# dispatching on each line's first character so only the patterns that can
+# apply are tried. Rendering into a Document is a separate step, so parsing
+# can be benchmarked and profiled on its own.
+# ---------------------------------------------------------------------------
+
+class Heading(NamedTuple):
+    level: int
+    text: str
+
+
+class CodeBlock(NamedTuple):
+    lines: list
+
+
+class Table(NamedTuple):
+    headers: list
+    rows: list
+
+
+class ListItem(NamedTuple):
+    ordered: bool
+    text: str
+
+
+class Image(NamedTuple):
+    alt: str
+    path: str
+
+
+class Screenshot(NamedTuple):
+    description: str
+
+
+class Paragraph(NamedTuple):
+    text: str
+
+
+SCREENSHOT_RE = re.compile(r'\[SCREENSHOT:\s*(.+?)\]')
+TABLE_SEP_RE = re.compile(r'\|[\s\-:|]+\|')
+NUMBERED_RE = re.compile(r'(\d+)\.\s+(.+)')
+BULLET_RE = re.compile(r'^[\s]*[-*]\s+')
+HEADING_PREFIXES = (('# ', 1), ('## ', 2), ('### ', 3), ('#### ', 4))
+
+
+def _table_cells(stripped: str) -> list:
+    return [c.strip() for c in stripped.strip('|').split('|')]
+
+
+class LineReader:
+    """Iterator over a source's lines, without line endings, with one line of
+    lookahead.
+
+    Lines come out exactly as str.split('\n') would produce them, including
+    a final empty line after a trailing newline.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, str):
+            source = io.StringIO(source)
+        self._lines = self._split(source)
+        self._next = next(self._lines, None)
+
+    @staticmethod
+    def _split(stream):
+        ended = True
+        for line in stream:
+            ended = line.endswith('\n')
+            yield line[:-1] if ended else line
+        if ended:
+            yield ''
+
+    def peek(self):
+        """The next line, without consuming it; None at end of input."""
+        return self._next
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self._next
+        if line is None:
+            raise StopIteration
+        self._next = next(self._lines, None)
+        return line
+
+
+def tokenize(source):
+    """Yield block tokens for a markdown document.
+
+    source is the markdown text, or a text stream (an open file, a pipe,
+    sys.stdin) which is consumed line by line.
+    """
+    reader = LineReader(source)
+    code_lines = None      # list while inside a fenced code block
+    table = None           # Table while collecting table rows
+
+    for line in reader:
+        stripped = line.strip()
+
+        if code_lines is not None:
+            if stripped.startswith('```'):
+                yield CodeBlock(code_lines)
+                code_lines = None
+            else:
+                code_lines.append(line)
+            continue
+
+        if table is not None:
+            if stripped.startswith('|'):
+                cells = _table_cells(stripped)
+                if any(cells):
+                    table.rows.append(cells)
+                    continue
+                # A row of empty cells ends the table and is consumed
+                if table.rows:
+                    yield table
+                table = None
+                continue
+            if table.rows:
+                yield table
+            table = None
+
+        if not stripped:
+            continue
+
+        first = stripped[0]
+
+        if first == '`':
+            if stripped.startswith('```'):
+                code_lines = []
+                continue
+
+        elif first == '|':
+            following = reader.peek()
+            if following is not None and TABLE_SEP_RE.match(following.strip()):
+                table = Table(_table_cells(stripped), [])
+                next(reader)  # Skip separator
+                continue
+
+        elif first == '!':
+            img_match = IMAGE_RE.match(stripped)
+            if img_match:
+                yield Image(img_match.group(1), img_match.group(2))
+                continue
+
+        elif first == '[':
+            screenshot_match = SCREENSHOT_RE.match(stripped)
+            if screenshot_match:
+                yield Screenshot(screenshot_match.group(1))
+                continue
+
+        elif first == '#':
+            for prefix, level in HEADING_PREFIXES:
+                if line.startswith(prefix):
+                    yield Heading(level, line[len(prefix):].strip())
+                    break
+            else:
+                yield Paragraph(line)
+            continue
+
+        elif first.isdigit():
+            num_match = NUMBERED_RE.match(line)
+            if num_match:
+                yield ListItem(True, num_match.group(2))
+                continue
+
+        elif first == '-' or first == '*':
+            if stripped.startswith('- ') or stripped.startswith('* '):
+                yield ListItem(False, BULLET_RE.sub('', line, count=1))
+                continue
+
+        yield Paragraph(line)
+
+    # Flush an unterminated code block or a table running to end of file
+    if code_lines is not None:
+        yield CodeBlock(code_lines)
+    if table is not None and table.rows:
+        yield table
+
+
+def referenced_images(md_path: str) -> list:
+    """Return the resolved paths of images a markdown file embeds, in order."""
+    md_dir = Path(md_path).parent
+    with open(md_path, encoding='utf-8') as f:
+        return [
+            (md_dir / token.path).resolve()
+            for token in tokenize(f)
+            if type(token) is Image
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Inline formatting within a paragraph or list item: **bold**, *italic*,
+# ***both***, `code` and [links](target), nesting freely except inside code.
+# Emphasis is matched as in CommonMark, in one pass over a stack of star
+# runs: a run can open emphasis when followed by non-space and close it when
+# preceded by non-space, and unmatched stars stay literal text. Links keep
+# their text; an absolute target (https:, mailto:, ...) follows it in
+# parentheses, while relative targets (other markdown files) are dropped.
+# ---------------------------------------------------------------------------
+
+class RunSpec(NamedTuple):
+    text: str
+    bold: bool = False
+    italic: bool = False
+    code: bool = False
+
+
+# Distinct strings whose runs are remembered; list items and boilerplate
+# lines repeat within and across documents
+INLINE_CACHE_SIZE = 8192
+INLINE_MARKER_RE = re.compile(r'[*`\[\]]')
+URL_SCHEME_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:')
+
+
+class _Delimiter:
+    """A run of stars: its piece, the stars still unmatched, and its role."""
+    __slots__ = ('piece', 'count', 'length', 'can_open', 'can_close')
+
+    def __init__(self, piece: int, length: int, can_open: bool, can_close: bool):
+        self.piece = piece
+        self.count = self.length = length
+        self.can_open = can_open
+        self.can_close = can_close
+
+
+def _match_emphasis(delims: list, pieces: list, bold: list, italic: list):
+    """Pair up the star runs in delims, left to right.
+
+    Each pair adds a level of bold (two stars) or italic (one star) to the
+    pieces between them, recorded as +1 and -1 marks in bold or italic.
+    Openers are kept on a stack. As in CommonMark, a closer passes over
+    openers that break the "multiple of 3" rule, and for each kind of closer
+    the depth below which no opener fits is remembered, so the whole pass
+    stays linear. Stars left unmatched remain as text.
+    """
+    openers = []
+    bottoms = {}
+    for closer in delims:
+        while closer.can_close and closer.count:
+            key = (closer.length % 3, closer.can_open)
+            floor = bottoms.get(key, 0)
+            k = len(openers) - 1
+            while k >= floor:
+                opener = openers[k]
+                if not ((opener.can_close or closer.can_open)
+                        and (opener.length + closer.length) % 3 == 0
+                        and (opener.length % 3 or closer.length % 3)):
+                    break
+                k -= 1
+            if k < floor:
+                bottoms[key] = len(openers)
+                break
+            use = 2 if opener.count >= 2 and closer.count >= 2 else 1
+            marks = bold if use == 2 else italic
+            marks[opener.piece + 1] += 1
+            marks[closer.piece] -= 1
+            opener.count -= use
+            closer.count -= use
+            # Star runs between the pair can no longer match anything
+            del openers[k + 1 if opener.count else k:]
+            for other, bottom in bottoms.items():
+                if bottom > len(openers):
+                    bottoms[other] = len(openers)
+        if closer.count and closer.can_open:
+            openers.append(closer)
+    for delim in delims:
+        pieces[delim.piece][0] = '*' * delim.count
+
+
+@functools.lru_cache(maxsize=INLINE_CACHE_SIZE)
+def inline_runs(text: str) -> tuple:
+    """Return the RunSpecs for a line of inline markdown, in order.
+
+    The line is split into pieces (plain text, code spans, star runs and
+    link brackets) in one scan, resolving links as each ']' is reached.
+    Emphasis is matched afterwards, separately within each link's text and
+    in the rest of the line, so a span never crosses a link boundary.
+    """
+    if '*' not in text and '`' not in text and '[' not in text:
+        # Plain text: nothing to lex
+        return (RunSpec(text),) if text else ()
+
+    n = len(text)
+    pieces = []         # [text, is code]
+    delims = []         # star runs not inside a resolved link
+    groups = [delims]   # star runs matched apart: the line, then each link's text
+    brackets = []       # (piece of an unresolved '[', len(delims) at it)
+    active = 0          # brackets below this index are inside a link
+    next_tick = next_paren = 0
+    i = start = 0
+    while True:
+        # Skip straight to the next character that can start or end a span
+        marker = INLINE_MARKER_RE.search(text, i)
+        if marker is None:
+            break
+        i = marker.start()
+        c = text[i]
+        if c == '`':
+            if next_tick != -1 and next_tick <= i:
+                next_tick = text.find('`', i + 1)
+            if next_tick > i + 1:
+                pieces.append([text[start:i], False])
+                pieces.append([text[i + 1:next_tick], True])
+                i = start = next_tick + 1
+                continue
+            i += 1
+        elif c == '*':
+            j = i
+            while j < n and text[j] == '*':
+                j += 1
+            pieces.append([text[start:i], False])
+            delims.append(_Delimiter(len(pieces), j - i, j < n and not text[j].isspace(),
+                                     i > 0 and not text[i - 1].isspace()))
+            pieces.append([text[i:j], False])
+            i = start = j
+        elif c == '[':
+            pieces.append([text[start:i], False])
+            brackets.append((len(pieces), len(delims)))
+            pieces.append(['[', False])
+            i = start = i + 1
+        else:
+            if brackets and text.startswith('(', i + 1) and len(brackets) > active:
+                if next_paren != -1 and next_paren <= i + 1:
+                    next_paren = text.find(')', i + 2)
+                if next_paren != -1:
+                    opener, mark = brackets.pop()
+                    pieces.append([text[start:i], False])
+                    pieces[opener][0] = ''
+                    groups.append(delims[mark:])
+                    del delims[mark:]
+                    target = text[i + 2:next_paren]
+                    if URL_SCHEME_RE.match(target):
+                        pieces.append([f' ({target})', False])
+                    # No links within links
+                    active = len(brackets)
+                    i = start = next_paren + 1
+                    continue
+            if brackets:
+                # Not a link: both brackets stay literal text
+                brackets.pop()
+                active = min(active, len(brackets))
+            i += 1
+    pieces.append([text[start:], False])
+    bold = [0] * (len(pieces) + 1)
+    italic = [0] * (len(pieces) + 1)
+    for group in groups:
+        _match_emphasis(group, pieces, bold, italic)
+
+    # Merge consecutive pieces formatted alike into one run
+    runs = []
+    parts = []
+    style = None
+    bold_depth = italic_depth = 0
+    for index, (piece, code) in enumerate(pieces):
+        bold_depth += bold[index]
+        italic_depth += italic[index]
+        if not piece:
+            continue
+        piece_style = (bold_depth > 0, italic_depth > 0, code)
+        if piece_style != style:
+            if parts:
+                runs.append(RunSpec(''.join(parts), *style))
+            parts = []
+            style = piece_style
+        parts.append(piece)
+    if parts:
+        runs.append(RunSpec(''.join(parts), *style))
+    return tuple(runs)
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """Regenerate all .docx files from their .md sources."""
 
+import argparse
+import contextlib
+import functools
+import io
+import json
 import os
 import sys
+import time
+from datetime import datetime
+from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(__file__))
-from generate_docx import md_to_docx
+from build_settings import CACHE_DIR, GENERATOR_VERSION, write_atomic
+from docx_package import COMPRESSLEVEL
+from markdown_blocks import referenced_images
+from image_pipeline import PIPELINE_VERSION, image_info, save_image_index, source_hash
 
 DOCS_DIR = os.path.join(os.path.dirname(__file__), '..', 'docs')
+MANIFEST_PATH = CACHE_DIR / 'docx-manifest.json'
 
 # Map of md files to (title, subtitle)
 DOCS = {
@@ -31,34 +43,340 @@ DOCS = {
     "api-reference/webhooks-and-events.md": ("Webhooks & Events", "Event System Documentation"),
 }
 
-def main():
-    success = 0
-    errors = 0
-    for md_rel, (title, subtitle) in DOCS.items():
+INDEX_DOC = ("document-index.md", "Document Index", "Complete Documentation Catalog")
+
+
+def build_jobs():
+    """Return the ordered list of (md_rel, title, subtitle) conversions to run."""
+    jobs = [(md_rel, title, subtitle) for md_rel, (title, subtitle) in DOCS.items()]
+    jobs.append(INDEX_DOC)
+    return jobs
+
+
+def _image_hash(img) -> str:
+    """Content hash of an image, from the image index where possible."""
+    try:
+        return image_info(img)['sha256']
+    except OSError:
+        # Not a readable image (md_to_docx renders a placeholder); hash the bytes
+        return source_hash(img)
+
+
+def fingerprint(job, compact_code=False, compresslevel=COMPRESSLEVEL):
+    """Describe everything a document's output depends on."""
+    md_rel, title, subtitle = job
+    md_path = os.path.join(DOCS_DIR, md_rel)
+    docs_root = os.path.realpath(DOCS_DIR)
+    images = {}
+    for img in referenced_images(md_path):
+        key = os.path.relpath(img, docs_root)
+        images[key] = _image_hash(img) if img.exists() else None
+    return {
+        "generator": GENERATOR_VERSION,
+        "image_pipeline": PIPELINE_VERSION,
+        "title": title,
+        "subtitle": subtitle,
+        "compact_code": compact_code,
+        "compresslevel": compresslevel,
+        "source": source_hash(md_path),
+        "images": images,
+    }
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def report_stale(manifest, jobs):
+    """Report (and forget) outputs whose markdown source no longer exists."""
+    known = {md_rel for md_rel, _, _ in jobs}
+    for md_rel in sorted(manifest):
         md_path = os.path.join(DOCS_DIR, md_rel)
+        if md_rel in known and os.path.exists(md_path):
+            continue
         docx_path = md_path.replace('.md', '.docx')
+        if os.path.exists(docx_path):
+            print(f"  STALE: {os.path.relpath(docx_path, DOCS_DIR)} (source {md_rel} removed)")
+        else:
+            del manifest[md_rel]
+
+
+def convert_one(job, compact_code=False, profile=False, backend='python-docx',
+                compresslevel=COMPRESSLEVEL):
+    """Convert a single document, capturing its output.
+
+    Runs in a worker process when --jobs > 1, so output is buffered and
+    returned rather than printed, letting the parent report in a fixed order.
+    Returns (md_rel, status, output, profile) where status is 'ok', 'skip' or
+    'error', and profile is the document's stage profile when requested.
+    """
+    md_rel, title, subtitle = job
+    md_path = os.path.join(DOCS_DIR, md_rel)
+    docx_path = md_path.replace('.md', '.docx')
+    if not os.path.exists(md_path):
+        # The index is optional, so its absence is not reported
+        note = '' if job == INDEX_DOC else f"  SKIP: {md_rel} (not found)\n"
+        return md_rel, 'skip', note, None
+
+    # python-docx is only needed once there is a document to convert
+    from generate_docx import md_to_docx, new_profile
+
+    buf = io.StringIO()
+    stats = new_profile() if profile else None
+    try:
+        with contextlib.redirect_stdout(buf):
+            md_to_docx(md_path, docx_path, title, subtitle, compact_code=compact_code,
+                       profile=stats, backend=backend, compresslevel=compresslevel)
+    except Exception as e:
+        buf.write(f"  ERROR: {md_rel}: {e}\n")
+        return md_rel, 'error', buf.getvalue(), None
+    return md_rel, 'ok', buf.getvalue(), stats
+
+
+def print_profile(profiles: dict):
+    """Print per-document and per-stage timing tables."""
+    if not profiles:
+        return
+    width = max(len(md_rel) for md_rel in profiles)
+    print(f"\n{'Document':<{width}}  {'Total s':>8}  {'Parse s':>8}  {'Save s':>7}"
+          f"  {'Elements':>8}  {'Images KB':>9}  {'Output KB':>9}")
+    for md_rel, p in sorted(profiles.items(), key=lambda item: -item[1]['total']):
+        print(f"{md_rel:<{width}}  {p['total']:>8.3f}  {p['stages'].get('parse', 0):>8.3f}"
+              f"  {p['stages'].get('save', 0):>7.3f}  {sum(p['counts'].values()):>8}"
+              f"  {p['image_bytes'] / 1024:>9.0f}  {p['output_bytes'] / 1024:>9.0f}")
+
+    stages, counts = {}, {}
+    for p in profiles.values():
+        for stage, seconds in p['stages'].items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+        for kind, n in p['counts'].items():
+            counts[kind] = counts.get(kind, 0) + n
+    total = sum(stages.values()) or 1.0
+    print(f"\n{'Stage':<10}  {'Seconds':>8}  {'Share':>6}  {'Count':>6}")
+    for stage, seconds in sorted(stages.items(), key=lambda item: -item[1]):
+        count = counts.get(stage, '')
+        print(f"{stage:<10}  {seconds:>8.3f}  {seconds / total:>6.1%}  {count:>6}")
+
+
+def save_profile(path: str, profiles: dict, wall: float, jobs: int):
+    """Write the profiles as JSON, for tracking build cost over time."""
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'generator': GENERATOR_VERSION,
+        'jobs': jobs,
+        'wall_seconds': wall,
+        'documents': profiles,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Profile written to {path}")
+
+
+# Files whose changes can affect a document
+WATCHED_SUFFIXES = ('.md', '.png', '.jpg', '.jpeg', '.gif')
+
+
+def _image_users(jobs: dict) -> dict:
+    """Map each resolved image path to the documents that embed it."""
+    users = {}
+    for md_rel in jobs:
+        md_path = os.path.join(DOCS_DIR, md_rel)
+        if os.path.exists(md_path):
+            for img in referenced_images(md_path):
+                users.setdefault(img, set()).add(md_rel)
+    return users
+
+
+def watch(manifest: dict, compact_code: bool = False, poll: bool = False,
+          backend: str = 'python-docx', compresslevel: int = COMPRESSLEVEL):
+    """Rebuild documents as their sources or images change, until interrupted.
+
+    Runs in this process, so python-docx, the base template, the image index
+    and the media pool stay loaded between rebuilds.
+    """
+    from file_watcher import open_watcher
+    import generate_docx
+
+    generate_docx.load_template()
+    if backend == 'stream':
+        import docx_stream
+    jobs = {job[0]: job for job in build_jobs()}
+    users = _image_users(jobs)
+    docs_root = Path(DOCS_DIR).resolve()
+    watcher = open_watcher(docs_root, lambda p: p.suffix.lower() in WATCHED_SUFFIXES, poll)
+    print(f"\nWatching {docs_root} ({watcher.kind}); press Ctrl+C to stop")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            affected = set()
+            for path in changed:
+                path = path.resolve()
+                if path.suffix == '.md':
+                    affected.add(path.relative_to(docs_root).as_posix())
+                affected |= users.get(path, set())
+
+            # Rebuild in catalog order, skipping anything whose inputs hash the same
+            for md_rel, job in jobs.items():
+                md_path = os.path.join(DOCS_DIR, md_rel)
+                if md_rel not in affected or not os.path.exists(md_path):
+                    continue
+                current = fingerprint(job, compact_code, compresslevel)
+                if (manifest.get(md_rel) == current
+                        and os.path.exists(md_path.replace('.md', '.docx'))):
+                    continue
+                start = time.perf_counter()
+                _, status, output, _ = convert_one(job, compact_code, backend=backend,
+                                                   compresslevel=compresslevel)
+                sys.stdout.write(output)
+                if status == 'ok':
+                    manifest[md_rel] = current
+                    print(f"  {md_rel}: rebuilt in {time.perf_counter() - start:.2f}s")
+                else:
+                    manifest.pop(md_rel, None)
+                # The edit may have added or removed image references
+                for doc_users in users.values():
+                    doc_users.discard(md_rel)
+                for img in referenced_images(md_path):
+                    users.setdefault(img, set()).add(md_rel)
+            save_manifest(manifest)
+            save_image_index()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of cores; 1 runs serially)",
+    )
+    parser.add_argument(
+        '-f', '--force', action='store_true',
+        help="rebuild every document even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        '--compact-code', action='store_true',
+        help="render each fenced code block as one paragraph with line breaks",
+    )
+    parser.add_argument(
+        '--backend', choices=('python-docx', 'stream'), default='python-docx',
+        help="how documents are written: through python-docx's object model, or "
+             "streamed directly as XML, which is much faster (same output)",
+    )
+    parser.add_argument(
+        '--compress-level', type=int, choices=range(10), default=COMPRESSLEVEL,
+        metavar='0-9',
+        help=f"zlib level for the XML parts of each .docx; images are stored "
+             f"uncompressed (default: {COMPRESSLEVEL})",
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="after building, keep running and rebuild documents as their "
+             ".md sources or images change",
+    )
+    parser.add_argument(
+        '--poll', action='store_true',
+        help="with --watch, poll for changes instead of using inotify",
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="time each stage of every document and print a summary",
+    )
+    parser.add_argument(
+        '--profile-json', metavar='PATH',
+        help="also write the profile to PATH as JSON (implies --profile)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiling = args.profile or bool(args.profile_json)
+    start = time.perf_counter()
+    manifest = load_manifest()
+    jobs = build_jobs()
+
+    # Skip documents whose source, images, titles and generator are unchanged
+    fingerprints = {}
+    pending = []
+    up_to_date = 0
+    for job in jobs:
+        md_rel = job[0]
+        md_path = os.path.join(DOCS_DIR, md_rel)
         if os.path.exists(md_path):
-            try:
-                md_to_docx(md_path, docx_path, title, subtitle)
+            fingerprints[md_rel] = fingerprint(job, args.compact_code, args.compress_level)
+            docx_path = md_path.replace('.md', '.docx')
+            if (not args.force and os.path.exists(docx_path)
+                    and manifest.get(md_rel) == fingerprints[md_rel]):
+                up_to_date += 1
+                continue
+        pending.append(job)
+    jobs = pending
+    # Workers inherit (or reload) the index, so no image is re-inspected
+    save_image_index()
+
+    workers = max(1, min(args.jobs, len(jobs)))
+    if jobs:
+        # Load the generator and base template before forking so workers start warm
+        import generate_docx
+        generate_docx.load_template()
+        if args.backend == 'stream':
+            import docx_stream
+
+    convert = functools.partial(convert_one, compact_code=args.compact_code, profile=profiling,
+                                backend=args.backend, compresslevel=args.compress_level)
+    if workers == 1:
+        results = map(convert, jobs)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # map() yields in submission order, so output stays deterministic
+        results = executor.map(convert, jobs)
+
+    success = 0
+    errors = 0
+    profiles = {}
+    try:
+        for md_rel, status, output, stats in results:
+            sys.stdout.write(output)
+            if status == 'ok':
+                manifest[md_rel] = fingerprints[md_rel]
+                if stats is not None:
+                    profiles[md_rel] = stats
                 success += 1
-            except Exception as e:
-                print(f"  ERROR: {md_rel}: {e}")
+            elif status == 'error':
+                manifest.pop(md_rel, None)
                 errors += 1
-        else:
-            print(f"  SKIP: {md_rel} (not found)")
-
-    # Also regenerate index docx
-    index_md = os.path.join(DOCS_DIR, 'document-index.md')
-    index_docx = os.path.join(DOCS_DIR, 'document-index.docx')
-    if os.path.exists(index_md):
-        try:
-            md_to_docx(index_md, index_docx, "Document Index", "Complete Documentation Catalog")
-            success += 1
-        except Exception as e:
-            print(f"  ERROR: document-index.md: {e}")
-            errors += 1
-
-    print(f"\nDone: {success} generated, {errors} errors")
+    finally:
+        if workers > 1:
+            executor.shutdown()
+
+    report_stale(manifest, build_jobs())
+    save_manifest(manifest)
+
+    print(f"\nDone: {success} generated, {up_to_date} up to date, {errors} errors")
+
+    if profiling:
+        wall = time.perf_counter() - start
+        print_profile(profiles)
+        print(f"\nWall time: {wall:.2f}s with {workers} worker(s)")
+        if args.profile_json:
+            save_profile(args.profile_json, profiles, wall, workers)
+
+    if args.watch:
+        watch(manifest, args.compact_code, args.poll, args.backend, args.compress_level)
 
 
 if __name__ == '__main__':
@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 """Replace [SCREENSHOT: ...] placeholders with actual image references."""
 
-import re
+import argparse
+import difflib
+import functools
 import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+from build_settings import write_atomic
 
 DOCS_DIR = os.path.join(os.path.dirname(__file__), '..', 'docs')
 
+PLACEHOLDER_RE = re.compile(r'\[SCREENSHOT:\s*(.+?)\]')
+
 # Mapping: substring in placeholder description → screenshot filename
 # Screenshots are in docs/screenshots/, so paths are relative from each doc's location
 SCREENSHOT_MAP = [
@@ -83,23 +94,103 @@ SCREENSHOT_MAP = [
     ("Recovery Key", "settings-recovery-key.png"),
 ]
 
+class PatternMatcher:
+    """Aho-Corasick automaton over a list of substrings.
+
+    All patterns are matched in a single pass over the text; find() returns
+    the index of the earliest-listed pattern that occurs, so priority is the
+    same as testing each pattern in list order.
+    """
+
+    def __init__(self, patterns):
+        # goto[state] maps a character to the next state; out[state] is the
+        # lowest pattern index ending at state, following failure links
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [None]
+        for idx, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(None)
+                state = nxt
+            if self.out[state] is None:
+                self.out[state] = idx
+
+        # Breadth-first, so each failure target is complete before it is used
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[nxt] = target
+                inherited = self.out[self.fail[nxt]]
+                if inherited is not None and (self.out[nxt] is None or inherited < self.out[nxt]):
+                    self.out[nxt] = inherited
+
+    def find(self, text):
+        """Return the lowest index of a pattern occurring in text, or None."""
+        goto, fail, out = self.goto, self.fail, self.out
+        best = None
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            idx = out[state]
+            if idx is not None and (best is None or idx < best):
+                best = idx
+                if best == 0:
+                    break
+        return best
+
+
+# Built on first use: SCREENSHOT_MAP entries whose file exists, and a
+# matcher over their lowercased patterns
+_available = None
+_matcher = None
+
+
+def _compile():
+    global _available, _matcher
+    try:
+        present = set(os.listdir(os.path.join(DOCS_DIR, 'screenshots')))
+    except FileNotFoundError:
+        present = set()
+    _available = [(p, f) for p, f in SCREENSHOT_MAP if f in present]
+    _matcher = PatternMatcher([p.lower() for p, _ in _available])
+
+
 def get_screenshot_path(description, doc_subdir):
     """Find matching screenshot for a description, return relative path."""
-    desc_lower = description.lower()
-    for pattern, filename in SCREENSHOT_MAP:
-        if pattern.lower() in desc_lower:
-            screenshot_path = os.path.join(DOCS_DIR, 'screenshots', filename)
-            if os.path.exists(screenshot_path):
-                # Calculate relative path from doc's directory to screenshots/
-                if doc_subdir:
-                    return f"../screenshots/{filename}"
-                else:
-                    return f"screenshots/{filename}"
-    return None
-
-
-def process_file(filepath):
-    """Replace screenshot placeholders in a single file."""
+    if _matcher is None:
+        _compile()
+    idx = _matcher.find(description.lower())
+    if idx is None:
+        return None
+    filename = _available[idx][1]
+    # Calculate relative path from doc's directory to screenshots/
+    if doc_subdir:
+        return f"../screenshots/{filename}"
+    else:
+        return f"screenshots/{filename}"
+
+
+def process_file(filepath, dry_run=False, show_diff=False):
+    """Replace screenshot placeholders in a single file.
+
+    Returns (replacements, skipped descriptions, unified diff). With dry_run
+    the file is left untouched; the diff is only built when show_diff is set.
+    """
     with open(filepath, 'r') as f:
         content = f.read()
 
@@ -123,37 +214,84 @@ def process_file(filepath):
             skipped.append(description.strip())
             return match.group(0)  # Keep original placeholder
 
-    new_content = re.sub(r'\[SCREENSHOT:\s*(.+?)\]', replace_placeholder, content)
+    new_content = PLACEHOLDER_RE.sub(replace_placeholder, content)
 
+    diff = ''
     if replacements > 0:
-        with open(filepath, 'w') as f:
-            f.write(new_content)
+        if show_diff:
+            diff = ''.join(difflib.unified_diff(
+                content.splitlines(keepends=True), new_content.splitlines(keepends=True),
+                fromfile=f"a/docs/{rel_path}", tofile=f"b/docs/{rel_path}",
+            ))
+        if not dry_run:
+            write_atomic(filepath, new_content)
 
-    return replacements, skipped
+    return replacements, skipped, diff
 
 
-def main():
-    total_replaced = 0
-    total_skipped = []
-
+def markdown_files():
+    """All .md files under docs/, in os.walk order."""
+    paths = []
     for root, dirs, files in os.walk(DOCS_DIR):
         for filename in files:
             if filename.endswith('.md'):
-                filepath = os.path.join(root, filename)
-                replaced, skipped = process_file(filepath)
-                if replaced > 0 or skipped:
-                    rel = os.path.relpath(filepath, DOCS_DIR)
-                    print(f"  {rel}: {replaced} replaced, {len(skipped)} skipped")
-                    total_replaced += replaced
-                    total_skipped.extend(skipped)
-
-    print(f"\nTotal: {total_replaced} placeholders replaced")
+                paths.append(os.path.join(root, filename))
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help="number of worker threads (default: number of cores; 1 runs serially)",
+    )
+    parser.add_argument(
+        '-n', '--dry-run', action='store_true',
+        help="report replacements without writing; exit 1 if any are pending",
+    )
+    parser.add_argument(
+        '--diff', action='store_true',
+        help="print a unified diff of the replacements (implies --dry-run)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    dry_run = args.dry_run or args.diff
+    paths = markdown_files()
+
+    # Compile before any worker thread needs the matcher
+    _compile()
+    work = functools.partial(process_file, dry_run=dry_run, show_diff=args.diff)
+    if args.jobs > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(work, paths))
+    else:
+        results = [work(path) for path in paths]
+
+    total_replaced = 0
+    total_skipped = []
+    for filepath, (replaced, skipped, diff) in zip(paths, results):
+        if diff:
+            sys.stdout.write(diff)
+        if replaced > 0 or skipped:
+            rel = os.path.relpath(filepath, DOCS_DIR)
+            print(f"  {rel}: {replaced} replaced, {len(skipped)} skipped")
+            total_replaced += replaced
+            total_skipped.extend(skipped)
+
+    verb = "would be replaced" if dry_run else "replaced"
+    print(f"\nTotal: {total_replaced} placeholders {verb}")
     print(f"Skipped: {len(total_skipped)} placeholders (no matching screenshot)")
     if total_skipped:
         print("\nSkipped placeholders:")
         for desc in total_skipped:
             print(f"  - {desc}")
 
+    if dry_run and total_replaced:
+        sys.exit(1)
+
 
 if __name__ == '__main__':
     main()
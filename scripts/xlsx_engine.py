@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Table-driven workbook writer shared by the spreadsheet generators.
+
+A workbook is described declaratively as a list of SheetSpec (headers, rows,
+tab color, optional column widths) plus a WorkbookTheme holding the header
+and alternating row styles and the column-width rules. Sheets are written in
+openpyxl's write-only mode: each cell is emitted once, already carrying a
+named style, and rows are streamed to disk as they are appended.
+"""
+
+from typing import NamedTuple, Optional
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle
+from openpyxl.utils import get_column_letter
+
+# Named styles registered on every workbook the engine writes
+HEADER_STYLE = "Header"
+EVEN_ROW_STYLE = "Even Row"
+ODD_ROW_STYLE = "Odd Row"
+
+
+class WorkbookTheme(NamedTuple):
+    """Cell formatting and width rules for a workbook.
+
+    header, even_row and odd_row map NamedStyle keyword arguments (font,
+    fill, alignment, border); rows are numbered from 2, below the header.
+    """
+    header: dict
+    even_row: dict
+    odd_row: dict
+    width_padding: int = 3
+    min_width: int = 12
+    max_width: int = 55
+
+
+class SheetSpec(NamedTuple):
+    title: str
+    headers: list
+    rows: list
+    tab_color: Optional[str] = None
+    # Explicit column widths; measured from the content when omitted
+    widths: Optional[list] = None
+
+
+def register_named_styles(wb, theme: WorkbookTheme):
+    """Register the theme's header and alternating row styles on wb."""
+    for name, kwargs in (
+        (HEADER_STYLE, theme.header),
+        (EVEN_ROW_STYLE, theme.even_row),
+        (ODD_ROW_STYLE, theme.odd_row),
+    ):
+        wb.add_named_style(NamedStyle(name=name, **kwargs))
+
+
+def column_widths(headers, rows, theme: WorkbookTheme) -> list:
+    """Size each column to its longest line of text, in one pass over the rows."""
+    longest = [0] * len(headers)
+    for row in [headers, *rows]:
+        for col_idx, val in enumerate(row):
+            if val:
+                # Take the longest line in the cell for width calculation
+                line_len = max(len(line) for line in str(val).split("\n"))
+                if line_len > longest[col_idx]:
+                    longest[col_idx] = line_len
+    return [
+        min(max(length + theme.width_padding, theme.min_width), theme.max_width)
+        for length in longest
+    ]
+
+
+def _styled_row(ws, values, style):
+    row = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        row.append(cell)
+    return row
+
+
+def write_sheet(ws, spec: SheetSpec, theme: WorkbookTheme) -> int:
+    """Stream one sheet into a write-only worksheet; return its data row count.
+
+    Sheet-level settings (freeze panes, column widths) precede the rows in
+    the file, so they are applied before the first row is appended.
+    """
+    if spec.tab_color:
+        ws.sheet_properties.tabColor = spec.tab_color
+
+    # Freeze header row
+    ws.freeze_panes = "A2"
+
+    rows = spec.rows
+    widths = spec.widths
+    if widths is None:
+        rows = list(rows)
+        widths = column_widths(spec.headers, rows, theme)
+    for col_idx, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    ws.append(_styled_row(ws, spec.headers, HEADER_STYLE))
+    num_rows = 0
+    for row_idx, row in enumerate(rows, 2):
+        style = EVEN_ROW_STYLE if row_idx % 2 == 0 else ODD_ROW_STYLE
+        ws.append(_styled_row(ws, row, style))
+        num_rows += 1
+
+    # Auto-filter
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(spec.headers))}{num_rows + 1}"
+    return num_rows
+
+
+def write_workbook(output_path, sheets, theme: WorkbookTheme) -> list:
+    """Write sheets to output_path; return (title, data rows, columns) per sheet."""
+    wb = openpyxl.Workbook(write_only=True)
+    register_named_styles(wb, theme)
+
+    summary = []
+    for spec in sheets:
+        ws = wb.create_sheet(title=spec.title)
+        num_rows = write_sheet(ws, spec, theme)
+        summary.append((spec.title, num_rows, len(spec.headers)))
+
+    wb.save(output_path)
+    return summary